@@ -0,0 +1,76 @@
+import http.client
+import http.server
+import threading
+
+import pytest
+
+from api_client import ApiClient
+
+
+def test_requests_reuse_one_connection(api_request_context):
+    first = api_request_context.get("/users/1")
+    assert first.ok
+    opened = api_request_context.connections_opened
+    reused = api_request_context.connections_reused
+
+    response = api_request_context.get("/posts", params={"userId": 1})
+    assert response.status == 200
+    assert all(post["userId"] == 1 for post in response.json())
+    assert api_request_context.connections_opened == opened
+    assert api_request_context.connections_reused == reused + 1
+
+
+class DropSecondRequest(http.server.BaseHTTPRequestHandler):
+    """Answers the first request on a connection, then reads the next and hangs up"""
+    protocol_version = "HTTP/1.1"
+    received = []
+
+    def handle(self):
+        self.served = 0
+        super().handle()
+
+    def respond(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.received.append(self.command)
+        self.served += 1
+        if self.served > 1:
+            self.close_connection = True
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    do_GET = do_POST = respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def dropping_server():
+    DropSecondRequest.received = []
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), DropSecondRequest)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_post_is_never_resent(dropping_server):
+    with ApiClient(dropping_server) as client:
+        assert client.post("/transfer", data={"amount": 1}).ok
+        with pytest.raises(http.client.RemoteDisconnected):
+            client.post("/transfer", data={"amount": 1})
+        assert (client.connections_opened, client.connections_reused) == (1, 1)
+    assert DropSecondRequest.received == ["POST", "POST"]
+
+
+def test_get_is_retried_on_a_fresh_connection(dropping_server):
+    with ApiClient(dropping_server) as client:
+        assert client.get("/users").ok
+        assert client.get("/users").ok
+        assert (client.connections_opened, client.connections_reused) == (2, 1)
+    assert DropSecondRequest.received == ["GET", "GET", "GET"]
@@ -0,0 +1,225 @@
+"""
+Lightweight API Client
+
+Plain HTTP client for API tests, shaped like the parts of Playwright's
+APIRequestContext the tests use (get/post/..., response.status,
+response.json()), without starting the Playwright driver.
+
+Connections are kept alive and pooled, so a session-scoped client makes
+one TCP (and TLS) handshake per concurrent request rather than per test.
+"""
+
+import gzip
+import http.client
+import json
+import queue
+import select
+import zlib
+from urllib.parse import urlencode, urljoin, urlsplit
+
+# Errors that mean a pooled keep-alive connection was closed by the server
+# while idle; idempotent requests are retried once on a fresh connection
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+# Safe to resend: the server may already have acted on a request that
+# failed mid-flight, so POST and PATCH are never retried
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+
+def is_closed(conn):
+    """True if an idle connection's socket was closed by the server (or is unusable)"""
+    if conn.sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    # An idle keep-alive socket only turns readable on EOF or a reset
+    return bool(readable)
+
+
+class ApiResponse:
+    """A fully read HTTP response"""
+
+    def __init__(self, url, status, status_text, headers, body):
+        self.url = url
+        self.status = status
+        self.status_text = status_text
+        self.headers = headers
+        self._body = body
+
+    @property
+    def ok(self):
+        return 200 <= self.status <= 299
+
+    def body(self):
+        return self._body
+
+    def text(self):
+        return self._body.decode('utf-8')
+
+    def json(self):
+        return json.loads(self._body)
+
+    def __repr__(self):
+        return f'<ApiResponse {self.status} {self.url}>'
+
+
+class ApiClient:
+    """
+    Keep-alive HTTP client bound to a base URL.
+
+    Thread-safe: up to pool_size idle connections are kept and handed out
+    one per in-flight request. connections_opened and connections_reused
+    count how requests were served.
+
+    Usage:
+        client = ApiClient('http://127.0.0.1:5000')
+        response = client.post('/posts', data={'title': 'x'})
+        response.status, response.json()
+        client.dispose()
+    """
+
+    def __init__(self, base_url, timeout=30.0, pool_size=8, extra_http_headers=None):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f'Unsupported URL scheme in {base_url!r}')
+        self.base_url = base_url.rstrip('/') + '/'
+        self.timeout = timeout
+        self.extra_http_headers = dict(extra_http_headers or {})
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+        self.connections_opened = 0
+        self.connections_reused = 0
+
+    def _connect(self):
+        self.connections_opened += 1
+        connection_class = (
+            http.client.HTTPSConnection if self._scheme == 'https' else http.client.HTTPConnection
+        )
+        return connection_class(self._host, self._port, timeout=self.timeout)
+
+    def _checkout(self, fresh_only=False):
+        """
+        A pooled connection (reused=True) or a new one. With fresh_only,
+        pooled connections the server has already closed are discarded
+        rather than handed out.
+        """
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect(), False
+            if not fresh_only or not is_closed(conn):
+                self.connections_reused += 1
+                return conn, True
+            conn.close()
+
+    def _checkin(self, conn):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _target(self, path, params):
+        url = urljoin(self.base_url, path.lstrip('/')) if not urlsplit(path).scheme else path
+        if params:
+            url += ('&' if '?' in url else '?') + urlencode(params)
+        parts = urlsplit(url)
+        if (parts.scheme, parts.hostname, parts.port) != (self._scheme, self._host, self._port):
+            raise ValueError(f'{url} is not on {self.base_url}')
+        return url, parts.path + (f'?{parts.query}' if parts.query else '')
+
+    def fetch(self, path, method='GET', params=None, data=None, form=None, headers=None):
+        """
+        Send a request and read the whole response.
+
+        Idempotent methods are retried once if a pooled connection turns
+        out to be stale. Other methods are never resent; they only get
+        pooled connections that are still open.
+
+        data: dict/list is sent as JSON, str/bytes as-is. form: dict sent
+        as application/x-www-form-urlencoded.
+        """
+        url, target = self._target(path, params)
+        request_headers = {'Accept-Encoding': 'gzip, deflate', **self.extra_http_headers}
+        body = None
+        if form is not None:
+            body = urlencode(form).encode('utf-8')
+            request_headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        elif isinstance(data, (dict, list)):
+            body = json.dumps(data).encode('utf-8')
+            request_headers['Content-Type'] = 'application/json'
+        elif data is not None:
+            body = data.encode('utf-8') if isinstance(data, str) else data
+        request_headers.update(headers or {})
+        retry = method.upper() in IDEMPOTENT_METHODS
+
+        while True:
+            conn, reused = self._checkout(fresh_only=not retry)
+            try:
+                conn.request(method, target, body=body, headers=request_headers)
+                response = conn.getresponse()
+                payload = response.read()
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                if reused and retry:
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            break
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._checkin(conn)
+
+        encoding = response.getheader('Content-Encoding', '').lower()
+        if encoding == 'gzip':
+            payload = gzip.decompress(payload)
+        elif encoding == 'deflate':
+            payload = zlib.decompress(payload)
+
+        headers = {name.lower(): value for name, value in response.getheaders()}
+        return ApiResponse(url, response.status, response.reason, headers, payload)
+
+    def get(self, path, **kwargs):
+        return self.fetch(path, 'GET', **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.fetch(path, 'POST', **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.fetch(path, 'PUT', **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.fetch(path, 'PATCH', **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.fetch(path, 'DELETE', **kwargs)
+
+    def head(self, path, **kwargs):
+        return self.fetch(path, 'HEAD', **kwargs)
+
+    def dispose(self):
+        """Close every pooled connection"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.dispose()
@@ -0,0 +1,94 @@
+"""
+Async Browser Session
+
+Runs Playwright's async API on a private event loop in a background
+thread, so ordinary (sync) pytest tests can drive many pages at once
+from a single browser without an asyncio pytest plugin.
+"""
+
+import asyncio
+import threading
+
+
+class AsyncBrowserSession:
+    """
+    A shared async Chromium running on its own event loop thread.
+
+    Usage:
+        session = AsyncBrowserSession(headless=True).start()
+        title = session.run(some_coroutine(session.browser))
+        session.close()
+    """
+
+    def __init__(self, timeout=120, **launch_options):
+        self.timeout = timeout
+        self.launch_options = launch_options
+        self.browser = None
+        self._playwright = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="async-playwright", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+        try:
+            self.run(self._launch())
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    async def _launch(self):
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        self.browser = await self._playwright.chromium.launch(**self.launch_options)
+
+    async def _shutdown(self):
+        if self.browser is not None:
+            await self.browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the session's loop and return its result"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return future.result(timeout or self.timeout)
+
+    def close(self):
+        try:
+            self.run(self._shutdown())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+
+async def run_virtual_users(browser, flow, users, concurrency=10, context_options=None):
+    """
+    Run `flow(page, user_id)` for `users` simulated users over one browser.
+
+    Each user gets its own isolated context; at most `concurrency` users
+    are active at once. Returns the flows' results in user order, or
+    raises an ExceptionGroup with every failure.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_user(user_id):
+        async with semaphore:
+            context = await browser.new_context(**(context_options or {}))
+            try:
+                page = await context.new_page()
+                return await flow(page, user_id)
+            finally:
+                await context.close()
+
+    results = await asyncio.gather(
+        *(run_user(user_id) for user_id in range(users)), return_exceptions=True
+    )
+
+    failures = [r for r in results if isinstance(r, BaseException)]
+    if failures:
+        raise ExceptionGroup(f"{len(failures)} of {users} virtual users failed", failures)
+    return results
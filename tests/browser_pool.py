@@ -0,0 +1,119 @@
+"""
+Browser Context Pool
+
+Keeps one Chromium instance alive for the whole test session (one per
+xdist worker) and hands out fresh, isolated BrowserContexts from a
+pre-warmed pool.
+
+Contexts are never reused: a released context is closed and replaced
+with a new one, so cookies, storage and permissions cannot leak between
+tests. The browser itself is recycled after a configurable number of
+tests, or when the browser processes grow past a memory threshold.
+Holders of long-lived contexts register a recycle listener, since a
+recycle closes every context of the old browser.
+"""
+
+import os
+from collections import deque
+
+try:
+    import psutil
+except ImportError:  # Memory-based recycling is optional
+    psutil = None
+
+
+class BrowserContextPool:
+    """
+    Pool of ready-to-use BrowserContexts backed by a shared browser.
+
+    Args:
+        browser_type: Playwright BrowserType used to (re)launch the browser
+        size: Number of contexts kept warm and ready to hand out
+        recycle_after: Relaunch the browser after this many tests (0 = never)
+        max_memory_mb: Relaunch the browser once its processes use more than
+            this much resident memory (0 = never, requires psutil)
+        launch_options: Keyword arguments passed to browser_type.launch()
+        context_options: Keyword arguments passed to browser.new_context()
+    """
+
+    def __init__(self, browser_type, size=2, recycle_after=0, max_memory_mb=0,
+                 launch_options=None, context_options=None):
+        self.browser_type = browser_type
+        self.size = max(size, 0)
+        self.recycle_after = recycle_after
+        self.max_memory_mb = max_memory_mb
+        self.launch_options = launch_options or {}
+        if max_memory_mb and psutil is None:
+            raise RuntimeError('Memory-based browser recycling (PW_RECYCLE_MEMORY_MB) requires psutil')
+        self.context_options = context_options or {}
+
+        self.browser = None
+        self.tests_served = 0
+        self._warm = deque()
+        self._recycle_listeners = []
+        self._launch()
+
+    def _launch(self):
+        """Launch a new browser and fill the pool with fresh contexts"""
+        self.browser = self.browser_type.launch(**self.launch_options)
+        self.tests_served = 0
+        self._fill()
+
+    def _fill(self):
+        while len(self._warm) < self.size:
+            self._warm.append(self.browser.new_context(**self.context_options))
+
+    def _shutdown(self):
+        """Close every pooled context and the browser itself"""
+        while self._warm:
+            self._warm.popleft().close()
+        if self.browser is not None:
+            self.browser.close()
+            self.browser = None
+
+    def memory_mb(self):
+        """Resident memory of the Playwright driver and browser processes"""
+        if psutil is None:
+            return 0
+        total = 0
+        for child in psutil.Process(os.getpid()).children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return total / (1024 * 1024)
+
+    def needs_recycle(self):
+        if self.recycle_after and self.tests_served >= self.recycle_after:
+            return True
+        if self.max_memory_mb and self.memory_mb() > self.max_memory_mb:
+            return True
+        return False
+
+    def add_recycle_listener(self, callback):
+        """Call callback() before the browser is recycled; contexts still checked out die with it"""
+        self._recycle_listeners.append(callback)
+
+    def remove_recycle_listener(self, callback):
+        self._recycle_listeners.remove(callback)
+
+    def acquire(self):
+        """Take a fresh context from the pool (creating one if it's empty)"""
+        if self.needs_recycle():
+            for callback in list(self._recycle_listeners):
+                callback()
+            self._shutdown()
+            self._launch()
+
+        self.tests_served += 1
+        if self._warm:
+            return self._warm.popleft()
+        return self.browser.new_context(**self.context_options)
+
+    def release(self, context):
+        """Dispose of a used context and top the pool back up"""
+        context.close()
+        self._fill()
+
+    def close(self):
+        self._shutdown()
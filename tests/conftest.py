@@ -1,23 +1,257 @@
 import os
+import re
 import pytest
-from playwright.sync_api import sync_playwright
 
-@pytest.fixture
-def page():
-    """Fixture for UI testing with Playwright browser automation"""
+from api_client import ApiClient
+from async_browser import AsyncBrowserSession, run_virtual_users
+from browser_pool import BrowserContextPool
+from fake_jsonplaceholder import LIVE_BASE_URL, app as fake_jsonplaceholder_app
+from live_server import LiveServer
+from network_rules import apply_network_rules
+from phase_timing import PhaseTimer, failed_or_slow, record_navigation
+from shared_page import SharedPageCache, shared_page_settings
+
+TRACE_DIR = os.path.join(os.path.dirname(__file__), 'traces')
+TRACE_MODES = ('off', 'failing', 'on')
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "har(filename): HAR file under tests/hars to record/replay for this test")
+    config.addinivalue_line(
+        "markers",
+        "block_resources(*resource_types, third_party=False): abort these requests for this test",
+    )
+    config.addinivalue_line(
+        "markers",
+        "shared_page(url, scope='module'): read-only test; reuse one loaded page for url across the module or session",
+    )
+    config.pluginmanager.register(PhaseTimer(config), 'phase_timer')
+
+
+def trace_mode():
+    """
+    PW_TRACE: off (default), failing (keep traces of failing or slow tests)
+    or on (keep every trace). Traces are written to tests/traces.
+    """
+    mode = os.getenv('PW_TRACE', 'off')
+    if mode not in TRACE_MODES:
+        raise ValueError(f"PW_TRACE must be one of {', '.join(TRACE_MODES)}, got {mode!r}")
+    return mode
+
+
+def trace_path(node):
+    return os.path.join(TRACE_DIR, re.sub(r'[^\w.-]+', '_', node.nodeid) + '.zip')
+
+
+@pytest.fixture(scope="session")
+def playwright():
+    """
+    Single Playwright driver shared by the whole session.
+
+    Imported and started on first use, so runs without browser tests
+    never pay for the driver.
+    """
+    from playwright.sync_api import sync_playwright
+
     with sync_playwright() as p:
-        is_ci = os.getenv('CI') == 'true'
-        browser = p.chromium.launch(headless=is_ci)
-        page = browser.new_page()
-        yield page
-        browser.close()
-        
+        yield p
+
+
+@pytest.fixture(scope="session")
+def browser_pool(playwright):
+    """
+    One Chromium per session (or per xdist worker) with pre-warmed contexts.
+
+    Tuned through environment variables:
+    - PW_CONTEXT_POOL_SIZE: contexts kept warm (default 2)
+    - PW_RECYCLE_AFTER: relaunch the browser after N tests (default 0 = never)
+    - PW_RECYCLE_MEMORY_MB: relaunch once browser memory exceeds this (default 0 = never)
+    """
+    is_ci = os.getenv('CI') == 'true'
+    pool = BrowserContextPool(
+        playwright.chromium,
+        size=int(os.getenv('PW_CONTEXT_POOL_SIZE', '2')),
+        recycle_after=int(os.getenv('PW_RECYCLE_AFTER', '0')),
+        max_memory_mb=int(os.getenv('PW_RECYCLE_MEMORY_MB', '0')),
+        launch_options={'headless': is_ci},
+    )
+    yield pool
+    pool.close()
+
+
 @pytest.fixture
-def api_request_context():
-    """Fixture for API testing with Playwright request context"""
-    with sync_playwright() as p:
-        request_context = p.request.new_context(
-            base_url="https://jsonplaceholder.typicode.com"
+def context(browser_pool, request):
+    """
+    Fresh, isolated browser context for a single test.
+
+    HAR record/replay and resource blocking are applied per test, see
+    network_rules.py for the PW_HAR_* / PW_BLOCK_* settings and markers.
+    With PW_TRACE set, the context is traced and the trace kept according
+    to the test outcome.
+    """
+    mode = trace_mode()
+    context = browser_pool.acquire()
+    apply_network_rules(context, request.node)
+    if mode != 'off':
+        context.tracing.start(screenshots=True, snapshots=True, sources=True)
+
+    yield context
+
+    if mode == 'on' or (mode == 'failing' and failed_or_slow(request.node)):
+        os.makedirs(TRACE_DIR, exist_ok=True)
+        context.tracing.stop(path=trace_path(request.node))
+    elif mode != 'off':
+        context.tracing.stop()
+    browser_pool.release(context)
+
+
+def time_navigations(page, node):
+    """Record main-frame navigation timings of page against a test for the phase report"""
+    def on_request_finished(pw_request):
+        if pw_request.is_navigation_request() and pw_request.frame == page.main_frame:
+            timing = pw_request.timing
+            record_navigation(node, {
+                'url': pw_request.url,
+                'duration': timing['responseEnd'] / 1000 if timing['responseEnd'] >= 0 else None,
+                'timing': timing,
+            })
+
+    page.on('requestfinished', on_request_finished)
+
+
+def prepare_shared_page(page, node):
+    # Network rules and timing follow the test that first loads the page
+    apply_network_rules(page, node)
+    time_navigations(page, node)
+
+
+@pytest.fixture(scope="module")
+def shared_pages_module(browser_pool):
+    """Loaded pages for @pytest.mark.shared_page tests in one module"""
+    cache = SharedPageCache(browser_pool, on_new_page=prepare_shared_page)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture(scope="session")
+def shared_pages_session(browser_pool):
+    """Loaded pages for @pytest.mark.shared_page(..., scope="session") tests"""
+    cache = SharedPageCache(browser_pool, on_new_page=prepare_shared_page)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def page(request):
+    """
+    Fixture for UI testing with Playwright browser automation.
+
+    Tests marked @pytest.mark.shared_page(url) get an already-loaded page
+    shared with the other read-only tests for that URL, and fail if they
+    change it (see shared_page.py). Every other test gets a fresh page in
+    its own context.
+
+    Main-frame navigations are timed for the phase report.
+    """
+    marker = request.node.get_closest_marker('shared_page')
+    if marker is not None:
+        url, scope = shared_page_settings(marker)
+        cache = request.getfixturevalue(f'shared_pages_{scope}')
+        yield cache.get(url, request.node)
+        cache.verify(url, request.node)
+        return
+
+    page = request.getfixturevalue('context').new_page()
+    time_navigations(page, request.node)
+    yield page
+
+
+@pytest.fixture(scope="session")
+def async_browser():
+    """Shared async Chromium on its own event loop, for concurrent page flows"""
+    is_ci = os.getenv('CI') == 'true'
+    session = AsyncBrowserSession(headless=is_ci).start()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def async_context_factory(async_browser):
+    """
+    Async factory for fresh browser contexts (await it inside a flow).
+
+    Every context it creates is closed when the test ends.
+    """
+    contexts = []
+
+    async def new_context(**options):
+        context = await async_browser.browser.new_context(**options)
+        contexts.append(context)
+        return context
+
+    yield new_context
+
+    async def close_contexts():
+        for context in contexts:
+            await context.close()
+
+    async_browser.run(close_contexts())
+
+
+@pytest.fixture
+def async_page_factory(async_context_factory):
+    """Async factory for pages, each in its own isolated context"""
+
+    async def new_page(**context_options):
+        context = await async_context_factory(**context_options)
+        return await context.new_page()
+
+    return new_page
+
+
+@pytest.fixture
+def virtual_users(async_browser):
+    """
+    Runs an async user flow for many concurrent users over the shared browser.
+
+    Usage:
+        async def flow(page, user_id): ...
+        results = virtual_users(flow, users=20, concurrency=8)
+    """
+
+    def run(flow, users, concurrency=10, **context_options):
+        return async_browser.run(
+            run_virtual_users(async_browser.browser, flow, users, concurrency, context_options)
         )
-        yield request_context
-        request_context.dispose()
\ No newline at end of file
+
+    return run
+
+
+@pytest.fixture(scope="session")
+def api_base_url():
+    """
+    Base URL for the API tests.
+
+    Defaults to a local JSONPlaceholder stand-in started once per session.
+    Set API_TARGET=live to run against https://jsonplaceholder.typicode.com.
+    """
+    if os.getenv('API_TARGET', 'local') == 'live':
+        yield LIVE_BASE_URL
+        return
+
+    server = LiveServer(fake_jsonplaceholder_app).start()
+    yield server.url
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def api_request_context(api_base_url):
+    """
+    Session-wide HTTP client for API tests.
+
+    Same get/post/status/json() surface as Playwright's request context,
+    but plain keep-alive HTTP, so API-only runs never start Playwright.
+    """
+    client = ApiClient(api_base_url)
+    yield client
+    client.dispose()
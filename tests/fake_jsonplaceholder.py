@@ -0,0 +1,154 @@
+"""
+Local JSONPlaceholder Stand-in
+
+A small Flask app serving the /users and /posts resources of
+https://jsonplaceholder.typicode.com with the same response shapes, so
+API tests can run offline and deterministically.
+
+Like the real service, writes are faked: POST /posts echoes the payload
+with id 101 and nothing is persisted.
+"""
+
+from flask import Flask, jsonify, request
+
+LIVE_BASE_URL = "https://jsonplaceholder.typicode.com"
+
+USERS = [
+    {
+        "id": 1,
+        "name": "Leanne Graham",
+        "username": "Bret",
+        "email": "Sincere@april.biz",
+        "address": {
+            "street": "Kulas Light",
+            "suite": "Apt. 556",
+            "city": "Gwenborough",
+            "zipcode": "92998-3874",
+            "geo": {"lat": "-37.3159", "lng": "81.1496"}
+        },
+        "phone": "1-770-736-8031 x56442",
+        "website": "hildegard.org",
+        "company": {
+            "name": "Romaguera-Crona",
+            "catchPhrase": "Multi-layered client-server neural-net",
+            "bs": "harness real-time e-markets"
+        }
+    },
+    {
+        "id": 2,
+        "name": "Ervin Howell",
+        "username": "Antonette",
+        "email": "Shanna@melissa.tv",
+        "address": {
+            "street": "Victor Plains",
+            "suite": "Suite 879",
+            "city": "Wisokyburgh",
+            "zipcode": "90566-7771",
+            "geo": {"lat": "-43.9509", "lng": "-34.4618"}
+        },
+        "phone": "010-692-6593 x09125",
+        "website": "anastasia.net",
+        "company": {
+            "name": "Deckow-Crist",
+            "catchPhrase": "Proactive didactic contingency",
+            "bs": "synergize scalable supply-chains"
+        }
+    },
+    {
+        "id": 3,
+        "name": "Clementine Bauch",
+        "username": "Samantha",
+        "email": "Nathan@yesenia.net",
+        "address": {
+            "street": "Douglas Extension",
+            "suite": "Suite 847",
+            "city": "McKenziehaven",
+            "zipcode": "59590-4157",
+            "geo": {"lat": "-68.6102", "lng": "-47.0653"}
+        },
+        "phone": "1-463-123-4447",
+        "website": "ramiro.info",
+        "company": {
+            "name": "Romaguera-Jacobson",
+            "catchPhrase": "Face to face bifurcated interface",
+            "bs": "e-enable strategic applications"
+        }
+    }
+]
+
+POSTS = [
+    {
+        "userId": 1,
+        "id": 1,
+        "title": "sunt aut facere repellat provident occaecati excepturi optio reprehenderit",
+        "body": "quia et suscipit\nsuscipit recusandae consequuntur expedita et cum\n"
+                "reprehenderit molestiae ut ut quas totam\n"
+                "nostrum rerum est autem sunt rem eveniet architecto"
+    },
+    {
+        "userId": 1,
+        "id": 2,
+        "title": "qui est esse",
+        "body": "est rerum tempore vitae\nsequi sint nihil reprehenderit dolor beatae ea dolores neque\n"
+                "fugiat blanditiis voluptate porro vel nihil molestiae ut reiciendis\n"
+                "qui aperiam non debitis possimus qui neque nisi nulla"
+    },
+    {
+        "userId": 1,
+        "id": 3,
+        "title": "ea molestias quasi exercitationem repellat qui ipsa sit aut",
+        "body": "et iusto sed quo iure\nvoluptatem occaecati omnis eligendi aut ad\n"
+                "voluptatem doloribus vel accusantium quis pariatur\n"
+                "molestiae porro eius odio et labore et velit aut"
+    }
+]
+
+# JSONPlaceholder has 100 posts; new ones always get the next id
+NEXT_POST_ID = 101
+
+app = Flask(__name__)
+
+
+def _find(items, item_id):
+    return next((item for item in items if item["id"] == item_id), None)
+
+
+def _filtered(items):
+    """Apply ?field=value filters the way JSONPlaceholder does"""
+    for field, value in request.args.items():
+        items = [item for item in items if str(item.get(field)) == value]
+    return items
+
+
+@app.route('/users', methods=['GET'])
+def list_users():
+    return jsonify(_filtered(USERS))
+
+
+@app.route('/users/<int:user_id>', methods=['GET'])
+def get_user(user_id):
+    user = _find(USERS, user_id)
+    if user is None:
+        return jsonify({}), 404
+    return jsonify(user)
+
+
+@app.route('/posts', methods=['GET'])
+def list_posts():
+    return jsonify(_filtered(POSTS))
+
+
+@app.route('/posts/<int:post_id>', methods=['GET'])
+def get_post(post_id):
+    post = _find(POSTS, post_id)
+    if post is None:
+        return jsonify({}), 404
+    return jsonify(post)
+
+
+@app.route('/posts', methods=['POST'])
+def create_post():
+    payload = request.get_json(silent=True)
+    if payload is None:
+        payload = request.form.to_dict()
+    return jsonify({**payload, "id": NEXT_POST_ID}), 201
@@ -10,28 +10,432 @@ This simple API provides a transfer endpoint that:
 Used by Playwright integration tests to validate end-to-end transfer flow.
 """
 
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, request, jsonify, g, url_for, current_app
+from waitress.server import create_server as create_waitress_server
 import sqlite3
 import os
+import argparse
+import base64
+import bisect
+import gzip
+import hashlib
+import itertools
+import json
+import math
+import queue
+import re
+import signal
+import socket
+import threading
+import time
+import zlib
+from collections import OrderedDict
 from datetime import datetime
 
 app = Flask(__name__)
 
-# Database path
+# Default database path; tests point app.config['DATABASE'] elsewhere
 DB_PATH = os.path.join('tests', 'test_data.db')
+app.config['DATABASE'] = DB_PATH
+
+# Connection tuning
+POOL_SIZE = 8
+BUSY_TIMEOUT_MS = 5000
+CACHED_STATEMENTS = 256
+
+
+# Prometheus metrics. Each metric keeps its series in a dict keyed by label
+# values behind its own lock, so recording costs one lookup and an add.
+# With --processes > 1 every worker has its own registry and /metrics
+# reports the worker that answered.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _label_value(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_label_value(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{value}"' for name, value in extra]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Monotonic count per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, name, description, labelnames=()):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield f'{self.name}{_format_labels(self.labelnames, labels)} {value}'
+
+
+class Gauge(Counter):
+    """Value that can go up and down, such as requests in flight"""
+
+    kind = 'gauge'
+
+    def dec(self, labels=(), amount=1):
+        self.inc(labels, -amount)
+
+
+class Histogram:
+    """Observations per label set, bucketed by upper bound"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, description, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts (the last one is +Inf), sum, count
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self._lock:
+            snapshot = [(labels, list(counts), total, count)
+                        for labels, (counts, total, count) in self._series.items()]
+        for labels, counts, total, count in sorted(snapshot, key=lambda series: series[0]):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket_count
+                label_text = _format_labels(self.labelnames, labels, [('le', bound)])
+                yield f'{self.name}_bucket{label_text} {cumulative}'
+            label_text = _format_labels(self.labelnames, labels)
+            yield f'{self.name}_sum{label_text} {total}'
+            yield f'{self.name}_count{label_text} {count}'
+
+
+REQUESTS_IN_FLIGHT = Gauge('http_requests_in_flight', 'Requests currently being handled')
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Request latency by endpoint', ('method', 'endpoint'))
+RESPONSES = Counter(
+    'http_responses_total', 'Responses by endpoint and status code', ('method', 'endpoint', 'status'))
+REQUEST_QUERIES = Histogram(
+    'http_request_sqlite_queries', 'SQLite statements issued per request', ('endpoint',),
+    buckets=QUERY_COUNT_BUCKETS)
+QUERY_DURATION = Histogram(
+    'sqlite_query_duration_seconds', 'SQLite statement time (execute plus fetch) by endpoint',
+    ('endpoint', 'query'))
+METRICS = (REQUESTS_IN_FLIGHT, REQUEST_DURATION, RESPONSES, REQUEST_QUERIES, QUERY_DURATION)
+
+
+def render_metrics():
+    """All metrics in Prometheus text exposition format"""
+    lines = []
+    for metric in METRICS:
+        lines.append(f'# HELP {metric.name} {metric.description}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        lines.extend(metric.samples())
+    return '\n'.join(lines) + '\n'
+
+
+_WHITESPACE = re.compile(r'\s+')
+_PLACEHOLDER_LIST = re.compile(r'\bIN \(\?(?:\s*,\s*\?)*\)', re.IGNORECASE)
+_normalized_sql = {}
+
+
+def normalize_sql(sql):
+    """Statement text as a metric label: whitespace collapsed, `IN (?, ?, ...)` lists folded"""
+    label = _normalized_sql.get(sql)
+    if label is None:
+        label = _PLACEHOLDER_LIST.sub('IN (?, ...)', _WHITESPACE.sub(' ', sql).strip())
+        if len(_normalized_sql) < 10000:
+            _normalized_sql[sql] = label
+    return label
+
+
+# Endpoint and statement count of the request on each thread. A plain
+# thread-local, because looking through Flask's context proxies on every
+# statement would cost more than timing it.
+_request_state = threading.local()
+
+
+def _request_endpoint():
+    """Endpoint of the request being served on this thread, counting its queries"""
+    endpoint = getattr(_request_state, 'endpoint', None)
+    if endpoint is None:
+        return 'none'
+    _request_state.queries += 1
+    return endpoint
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    Cursor that times each statement, including fetching its rows.
+
+    Python's sqlite3 only exposes a trace callback (statement text, no
+    timings), so statements are timed here instead. SQLite steps through
+    rows lazily, so time spent in fetch*() is added to the statement that
+    produced them. The statement is recorded once its rows are exhausted,
+    the next statement runs, or the cursor is closed.
+    """
+
+    _pending = None
+
+    def _record(self):
+        if self._pending is not None:
+            endpoint, sql, elapsed = self._pending
+            self._pending = None
+            QUERY_DURATION.observe((endpoint, normalize_sql(sql)), elapsed)
+
+    def _execute(self, method, sql, *args):
+        self._record()
+        endpoint = _request_endpoint()
+        start = time.perf_counter()
+        try:
+            return method(self, sql, *args)
+        finally:
+            self._pending = (endpoint, sql, time.perf_counter() - start)
+            if self.description is None:
+                self._record()
+
+    def _fetch(self, method, *args):
+        start = time.perf_counter()
+        rows = method(self, *args)
+        if self._pending is not None:
+            endpoint, sql, elapsed = self._pending
+            self._pending = (endpoint, sql, elapsed + time.perf_counter() - start)
+            if not rows or method is sqlite3.Cursor.fetchall:
+                self._record()
+        return rows
+
+    def execute(self, sql, *args):
+        return self._execute(sqlite3.Cursor.execute, sql, *args)
+
+    def executemany(self, sql, *args):
+        return self._execute(sqlite3.Cursor.executemany, sql, *args)
+
+    def fetchone(self):
+        return self._fetch(sqlite3.Cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._fetch(sqlite3.Cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._fetch(sqlite3.Cursor.fetchall)
+
+    def close(self):
+        self._record()
+        super().close()
+
+    def __del__(self):
+        self._record()
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors, including execute() shortcuts, are instrumented"""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, *args):
+        return self.cursor().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        return self.cursor().executemany(sql, *args)
+
+
+class ConnectionPool:
+    """
+    Bounded pool of tuned SQLite connections shared by request threads.
+
+    Connections are opened lazily up to max_size and handed back after
+    each request, so connection setup stays off the hot path. Each one
+    runs in WAL mode with synchronous=NORMAL and a busy timeout, which
+    lets readers and a writer work concurrently instead of failing with
+    "database is locked".
+    """
+
+    def __init__(self, db_path, max_size=POOL_SIZE, timeout=BUSY_TIMEOUT_MS / 1000):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS,
+            isolation_level=None,  # Transactions are managed explicitly
+            factory=InstrumentedConnection,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = NORMAL')
+        conn.execute(f'PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}')
+        return conn
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._opened < self.max_size:
+                self._opened += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._opened -= 1
+                    raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise RuntimeError(
+                f'No database connection available after {self.timeout}s '
+                f'(pool size {self.max_size})'
+            )
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def close_all(self):
+        """Close every idle connection (call when no requests are running)"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path=None):
+    """Connection pool for a database path (defaults to app.config['DATABASE'])"""
+    db_path = db_path or current_app.config['DATABASE']
+    pool = _pools.get(db_path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(db_path, ConnectionPool(db_path))
+    return pool
+
+
+def close_pools():
+    """Close idle connections of every pool (call when no requests are running)"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close_all()
 
 
 def get_db_connection():
-    """Create database connection with row factory for dict-like access"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """
+    Get the pooled database connection for the current app context.
 
+    Row factory gives dict-like access; the connection is returned to
+    the pool automatically when the request ends.
+    """
+    if 'db' not in g:
+        g.db_pool = get_pool()
+        g.db = g.db_pool.acquire()
+    return g.db
 
-@app.route('/')
-def index():
-    """Serve the transfer form page"""
-    html = """
+
+@app.teardown_appcontext
+def release_db_connection(exception):
+    """Hand the request's connection back to the pool"""
+    conn = g.pop('db', None)
+    if conn is not None:
+        g.pop('db_pool').release(conn)
+
+
+@app.before_request
+def start_request_metrics():
+    """Name the endpoint for metrics and start counting its SQL statements"""
+    _request_state.endpoint = request.endpoint or 'unmatched'
+    _request_state.queries = 0
+    request.environ['metrics.endpoint'] = _request_state.endpoint
+
+
+@app.teardown_request
+def finish_request_metrics(exception):
+    if getattr(_request_state, 'endpoint', None) is not None:
+        request.environ['metrics.queries'] = _request_state.queries
+        _request_state.endpoint = None
+
+
+class RequestMetrics:
+    """WSGI middleware recording latency, responses by status and requests in flight"""
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        status = []
+
+        def start(status_line, headers, exc_info=None):
+            status.append(status_line[:3])
+            return start_response(status_line, headers, exc_info)
+
+        REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            return self.wsgi_app(environ, start)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.dec()
+
+            method = environ['REQUEST_METHOD']
+            endpoint = environ.get('metrics.endpoint', 'unmatched')
+            REQUEST_DURATION.observe((method, endpoint), elapsed)
+            RESPONSES.inc((method, endpoint, status[0] if status else '500'))
+            if 'metrics.queries' in environ:
+                REQUEST_QUERIES.observe((endpoint,), environ['metrics.queries'])
+
+
+app.wsgi_app = RequestMetrics(app.wsgi_app)
+
+
+@app.route('/metrics')
+def metrics():
+    """Request and SQL metrics in Prometheus text format"""
+    return app.response_class(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+# Transfer form page. The accounts are rendered into both dropdowns and
+# the account list on the server, so the form is usable as soon as the
+# HTML arrives; the client only fetches /api/accounts for accounts past
+# INDEX_ACCOUNTS_LIMIT.
+INDEX_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -96,14 +500,21 @@ def index():
         
         <div class="account-info" id="accounts-display">
             <h3>Available Accounts:</h3>
-            <div id="accounts-list"></div>
+            <div id="accounts-list"{% if next_cursor %} data-next-cursor="{{ next_cursor }}"{% endif %}>
+                {%- for account in accounts %}
+                <div data-account-id="{{ account.id }}">{{ account.name }}: ${{ '%.2f' % account.balance }}</div>
+                {%- endfor %}
+            </div>
         </div>
 
-        <form id="transfer-form">
+        <form id="transfer-form"{% if not next_cursor %} data-ready="true"{% endif %}>
             <div class="form-group">
                 <label for="from-account">From Account:</label>
                 <select id="from-account" name="from_account" data-testid="from-account-select" required>
                     <option value="">Select account...</option>
+                    {%- for account in accounts %}
+                    <option value="{{ account.id }}">{{ account.name }} - ${{ '%.2f' % account.balance }}</option>
+                    {%- endfor %}
                 </select>
             </div>
 
@@ -111,6 +522,9 @@ def index():
                 <label for="to-account">To Account:</label>
                 <select id="to-account" name="to_account" data-testid="to-account-select" required>
                     <option value="">Select account...</option>
+                    {%- for account in accounts %}
+                    <option value="{{ account.id }}">{{ account.name }} - ${{ '%.2f' % account.balance }}</option>
+                    {%- endfor %}
                 </select>
             </div>
 
@@ -125,44 +539,64 @@ def index():
         <div id="result" data-testid="transfer-result"></div>
 
         <script>
-            // Load accounts on page load
-            async function loadAccounts() {
+            // Load the accounts after the given id (keyset pages) and append
+            // them to the server-rendered ones
+            async function loadAccounts(after) {
                 try {
-                    const response = await fetch('/api/accounts');
-                    const accounts = await response.json();
+                    // Follow keyset pages until the server reports no more
+                    const accounts = [];
+                    const query = 'fields=id,name,account_balance&limit=1000';
+                    let url = `/api/accounts?${query}&after=${after}`;
+                    while (url) {
+                        const response = await fetch(url);
+                        accounts.push(...await response.json());
+                        const next = response.headers.get('X-Next-Cursor');
+                        url = next ? `/api/accounts?${query}&after=${next}` : null;
+                    }
                     
                     const fromSelect = document.getElementById('from-account');
                     const toSelect = document.getElementById('to-account');
                     const accountsList = document.getElementById('accounts-list');
                     
-                    // Clear existing options (keep placeholder)
-                    fromSelect.innerHTML = '<option value="">Select account...</option>';
-                    toSelect.innerHTML = '<option value="">Select account...</option>';
-                    accountsList.innerHTML = '';
-                    
                     // Populate dropdowns and display
                     accounts.forEach(account => {
                         // Add to dropdowns
                         const option1 = document.createElement('option');
                         option1.value = account.id;
-                        option1.textContent = `${account.name} - $${account.account_balance.toFixed(2)}`;
                         fromSelect.appendChild(option1);
                         
                         const option2 = document.createElement('option');
                         option2.value = account.id;
-                        option2.textContent = `${account.name} - $${account.account_balance.toFixed(2)}`;
                         toSelect.appendChild(option2);
                         
                         // Add to display list
                         const accountDiv = document.createElement('div');
-                        accountDiv.textContent = `${account.name}: $${account.account_balance.toFixed(2)}`;
+                        accountDiv.dataset.accountId = account.id;
                         accountsList.appendChild(accountDiv);
+
+                        showBalance(account);
                     });
+
+                    delete accountsList.dataset.nextCursor;
+                    // Signal tests that every account is selectable
+                    document.getElementById('transfer-form').dataset.ready = 'true';
                 } catch (error) {
                     console.error('Error loading accounts:', error);
                 }
             }
 
+            // Write one account's balance into its dropdown options and list entry
+            function showBalance(account) {
+                const balance = `$${account.account_balance.toFixed(2)}`;
+                document.querySelectorAll(`option[value="${account.id}"]`).forEach(option => {
+                    option.textContent = `${account.name} - ${balance}`;
+                });
+                const accountDiv = document.querySelector(`#accounts-list [data-account-id="${account.id}"]`);
+                if (accountDiv) {
+                    accountDiv.textContent = `${account.name}: ${balance}`;
+                }
+            }
+
             // Handle form submission
             document.getElementById('transfer-form').addEventListener('submit', async (e) => {
                 e.preventDefault();
@@ -190,10 +624,13 @@ def index():
                     if (data.success) {
                         resultDiv.className = 'success';
                         resultDiv.textContent = data.message;
-                        // Reload accounts to show updated balances
-                        setTimeout(loadAccounts, 500);
+                        // Patch the two accounts with the balances the transfer committed
+                        data.accounts.forEach(showBalance);
                         // Clear form
                         document.getElementById('transfer-form').reset();
+                        // Signal tests that the displayed balances are current
+                        document.getElementById('accounts-list').dataset.transactionId = data.transaction_id;
+                        document.dispatchEvent(new CustomEvent('balances-updated', {detail: data.accounts}));
                     } else {
                         resultDiv.className = 'error';
                         resultDiv.textContent = data.message;
@@ -205,32 +642,640 @@ def index():
                 }
             });
 
-            // Load accounts when page loads
-            loadAccounts();
+            // The server renders the first page of accounts; fetch the rest
+            // only when it says more follow. The form is marked ready after.
+            const nextCursor = document.getElementById('accounts-list').dataset.nextCursor;
+            if (nextCursor) {
+                loadAccounts(nextCursor);
+            }
         </script>
     </body>
     </html>
     """
-    return render_template_string(html)
+
+# Compress HTML/JSON responses at least this large when the client accepts it
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 6
+COMPRESSIBLE_MIMETYPES = ('text/html', 'application/json')
+ENCODINGS = ('gzip', 'deflate')
+
+
+def compress(body, encoding):
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=COMPRESS_LEVEL)
+    return zlib.compress(body, COMPRESS_LEVEL)
+
+
+INDEX_TEMPLATE = app.jinja_env.from_string(INDEX_HTML)
+INDEX_TEMPLATE_HASH = hashlib.sha256(INDEX_HTML.encode('utf-8')).hexdigest()[:16]
+
+# Accounts rendered into the page; any beyond this are fetched by the client
+INDEX_ACCOUNTS_LIMIT = 1000
+
+
+@app.after_request
+def compress_response(response):
+    """Gzip/deflate HTML and JSON bodies above COMPRESS_MIN_SIZE"""
+    if (response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+
+    encoding = request.accept_encodings.best_match(ENCODINGS)
+    if encoding:
+        response.set_data(compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+@app.route('/')
+def index():
+    """
+    Serve the transfer form page with the accounts rendered in
+
+    The ETag combines the template hash with accounts_version, so a
+    matching If-None-Match returns 304 after reading only the ledger
+    summary row.
+    """
+    cursor = get_db_connection().cursor()
+    summary = read_ledger_summary(cursor)
+    etag = f'index-{INDEX_TEMPLATE_HASH}-{summary["accounts_version"]}'
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        cursor.execute(
+            'SELECT id, name, account_balance FROM users ORDER BY id LIMIT ?',
+            (INDEX_ACCOUNTS_LIMIT + 1,)
+        )
+        rows = cursor.fetchall()
+        next_cursor = rows[INDEX_ACCOUNTS_LIMIT - 1]['id'] if len(rows) > INDEX_ACCOUNTS_LIMIT else None
+        accounts = [
+            {
+                'id': row['id'],
+                'name': row['name'],
+                'balance': from_stored(row['account_balance'], summary['money_scale']),
+            }
+            for row in rows[:INDEX_ACCOUNTS_LIMIT]
+        ]
+        html = INDEX_TEMPLATE.render(accounts=accounts, next_cursor=next_cursor)
+        response = app.response_class(html, mimetype='text/html')
+
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+ACCOUNT_FIELDS = ('id', 'name', 'email', 'account_balance')
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Account ids are SQLite rowids: positive 64-bit integers
+MAX_ACCOUNT_ID = 2**63 - 1
+
+
+def read_ledger_summary(cursor):
+    """
+    Read the single-row ledger summary maintained by triggers on users.
+
+    accounts_version: cheap data-version counter, bumped on every users change
+    total_cents: money in the system, as exact integer cents
+    money_scale: stored units per dollar (1 = REAL dollars, 100 = integer cents)
+    """
+    cursor.execute(
+        'SELECT accounts_version, total_cents, money_scale FROM ledger_summary WHERE id = 1'
+    )
+    return cursor.fetchone()
+
+
+def read_money_scale(cursor):
+    cursor.execute('SELECT money_scale FROM ledger_summary WHERE id = 1')
+    return cursor.fetchone()[0]
+
+
+def to_stored(amount, money_scale):
+    """Convert a dollar amount to the database's storage units"""
+    return amount if money_scale == 1 else round(amount * money_scale)
+
+
+def from_stored(value, money_scale):
+    """Convert a stored balance or amount back to dollars"""
+    return value if money_scale == 1 else value / money_scale
 
 
 @app.route('/api/accounts', methods=['GET'])
 def get_accounts():
-    """Get all accounts with current balances"""
+    """
+    Get accounts with current balances, one page at a time
+
+    Query parameters:
+        limit: page size (default 100, max 1000)
+        after: return accounts with id greater than this (keyset cursor)
+        fields: comma-separated subset of id,name,email,account_balance
+
+    The body is a JSON array. When more accounts follow, the X-Next-Cursor
+    header (and a Link rel="next" header) carry the cursor for the next
+    page. Responses carry an ETag; a matching If-None-Match returns 304
+    without reading the table.
+    """
     try:
+        try:
+            limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+            after = int(request.args.get('after', 0))
+        except ValueError:
+            return jsonify({'success': False, 'message': 'limit and after must be integers'}), 400
+
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            return jsonify({
+                'success': False,
+                'message': f'limit must be between 1 and {MAX_PAGE_SIZE}'
+            }), 400
+
+        # SQLite cannot bind integers outside 64 bits
+        if not 0 <= after <= MAX_ACCOUNT_ID:
+            return jsonify({
+                'success': False,
+                'message': f'after must be between 0 and {MAX_ACCOUNT_ID}'
+            }), 400
+
+        fields = request.args.get('fields')
+        fields = [f.strip() for f in fields.split(',') if f.strip()] if fields else list(ACCOUNT_FIELDS)
+        unknown = [f for f in fields if f not in ACCOUNT_FIELDS]
+        if unknown:
+            return jsonify({
+                'success': False,
+                'message': f'Unknown fields: {", ".join(unknown)}'
+            }), 400
+
         conn = get_db_connection()
         cursor = conn.cursor()
-        
-        cursor.execute('SELECT id, name, email, account_balance FROM users ORDER BY id')
-        accounts = [dict(row) for row in cursor.fetchall()]
-        
-        conn.close()
-        return jsonify(accounts)
+
+        summary = read_ledger_summary(cursor)
+        version = summary['accounts_version']
+        etag = f'accounts-{version}-{after}-{limit}-{".".join(fields)}'
+        if request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag, weak=True)
+            return response
+
+        # Always read id so the next cursor can be computed
+        columns = ['id'] + [f for f in fields if f != 'id']
+        cursor.execute(
+            f'SELECT {", ".join(columns)} FROM users WHERE id > ? ORDER BY id LIMIT ?',
+            (after, limit + 1)
+        )
+        rows = cursor.fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        accounts = [{field: row[field] for field in fields} for row in rows]
+        if summary['money_scale'] != 1 and 'account_balance' in fields:
+            for account in accounts:
+                account['account_balance'] = from_stored(account['account_balance'], summary['money_scale'])
+
+        response = jsonify(accounts)
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+        if has_more:
+            next_cursor = rows[-1]['id']
+            query = request.args.to_dict()
+            query['after'] = next_cursor
+            query['limit'] = limit
+            response.headers['X-Next-Cursor'] = str(next_cursor)
+            response.headers['Link'] = f'<{url_for("get_accounts", **query)}>; rel="next"'
+        return response
     
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+TRANSACTION_COLUMNS = (
+    'id, user_id, amount, transaction_type, status, '
+    'from_account_id, to_account_id, created_on'
+)
+
+
+def encode_history_cursor(created_on, transaction_id):
+    """Opaque keyset cursor for the (created_on, id) position of a history entry"""
+    raw = json.dumps([created_on, transaction_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_history_cursor(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    created_on, transaction_id = json.loads(base64.urlsafe_b64decode(padded))
+    return created_on, int(transaction_id)
+
+
+@app.route('/api/accounts/<int:account_id>/transactions', methods=['GET'])
+def get_account_transactions(account_id):
+    """
+    Get an account's transaction history, newest first
+
+    Query parameters:
+        limit: page size (default 100, max 1000)
+        before: cursor from a previous page's next_cursor
+        status: only entries with this status (e.g. completed, pending)
+        type: only entries with this transaction_type (e.g. deposit, transfer)
+
+    An account's history is everything it made (user_id) plus transfers
+    it received (to_account_id). Each half is read newest-first from its
+    own covering index and the two pages are merged.
+
+    Returns:
+    {
+        "account_id": 1,
+        "transactions": [...],
+        "next_cursor": "..." or null
+    }
+    """
+    try:
+        try:
+            limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            return jsonify({'success': False, 'message': 'limit must be an integer'}), 400
+
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            return jsonify({
+                'success': False,
+                'message': f'limit must be between 1 and {MAX_PAGE_SIZE}'
+            }), 400
+
+        before = request.args.get('before')
+        if before:
+            try:
+                before_created_on, before_id = decode_history_cursor(before)
+            except (ValueError, TypeError):
+                return jsonify({'success': False, 'message': 'Invalid cursor'}), 400
+        else:
+            # Sorts after any timestamp, so the first page starts at the newest entry
+            before_created_on, before_id = '\uffff', 0
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT 1 FROM users WHERE id = ?', (account_id,))
+        if cursor.fetchone() is None:
+            return jsonify({
+                'success': False,
+                'message': f'Account {account_id} not found'
+            }), 404
+
+        filters = ''
+        params = {
+            'account_id': account_id,
+            'before_created_on': before_created_on,
+            'before_id': before_id,
+            'limit': limit + 1,
+        }
+        if request.args.get('status'):
+            filters += ' AND status = :status'
+            params['status'] = request.args['status']
+        if request.args.get('type'):
+            filters += ' AND transaction_type = :type'
+            params['type'] = request.args['type']
+
+        page_order = 'ORDER BY created_on DESC, id DESC LIMIT :limit'
+        keyset = '(created_on, id) < (:before_created_on, :before_id)'
+        cursor.execute(f'''
+            SELECT * FROM (
+                SELECT {TRANSACTION_COLUMNS} FROM transactions
+                WHERE user_id = :account_id AND {keyset}{filters}
+                {page_order}
+            )
+            UNION ALL
+            SELECT * FROM (
+                SELECT {TRANSACTION_COLUMNS} FROM transactions
+                WHERE to_account_id = :account_id AND user_id != :account_id AND {keyset}{filters}
+                {page_order}
+            )
+            {page_order}
+        ''', params)
+        rows = cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_history_cursor(rows[-1]['created_on'], rows[-1]['id'])
+
+        transactions = [dict(row) for row in rows]
+        money_scale = read_money_scale(cursor)
+        if money_scale != 1:
+            for transaction in transactions:
+                transaction['amount'] = from_stored(transaction['amount'], money_scale)
+
+        return jsonify({
+            'account_id': account_id,
+            'transactions': transactions,
+            'next_cursor': next_cursor
+        })
+
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
+# Largest single transfer in dollars; keeps stored amounts well inside
+# SQLite's 64-bit integers in cents mode
+MAX_TRANSFER_AMOUNT = 1_000_000_000
+
+
+class TransferError(Exception):
+    """A transfer rejected by validation or by the ledger"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.index = None  # Position within a batch, when applicable
+
+
+def validate_transfer(data):
+    """
+    Check a transfer payload and return (from_account_id, to_account_id, amount).
+
+    Raises TransferError for missing fields, non-integer or out-of-range
+    account ids, non-numeric, non-finite or oversized amounts, same-account transfers,
+    non-positive amounts and amounts that are not whole cents.
+    """
+    if not isinstance(data, dict):
+        raise TransferError('Request body must be a JSON object')
+
+    from_account_id = data.get('from_account_id')
+    to_account_id = data.get('to_account_id')
+    amount = data.get('amount')
+
+    if not all([from_account_id, to_account_id, amount]):
+        raise TransferError('Missing required fields: from_account_id, to_account_id, amount')
+
+    # bool is an int subclass, but true is not an account id or amount
+    if any(isinstance(value, bool) or not isinstance(value, int)
+           for value in (from_account_id, to_account_id)):
+        raise TransferError('Account ids must be integers')
+
+    if not all(1 <= value <= MAX_ACCOUNT_ID for value in (from_account_id, to_account_id)):
+        raise TransferError(f'Account ids must be between 1 and {MAX_ACCOUNT_ID}')
+
+    if isinstance(amount, bool) or not isinstance(amount, (int, float)):
+        raise TransferError('Transfer amount must be a number')
+
+    # Flask's JSON parser accepts NaN and Infinity. Integers are always
+    # finite, and too large ones would overflow math.isfinite.
+    if isinstance(amount, float) and not math.isfinite(amount):
+        raise TransferError('Transfer amount must be a finite number')
+
+    if from_account_id == to_account_id:
+        raise TransferError('Cannot transfer to the same account')
+
+    if amount <= 0:
+        raise TransferError('Transfer amount must be greater than zero')
+
+    if amount > MAX_TRANSFER_AMOUNT:
+        raise TransferError(f'Transfer amount must not exceed ${MAX_TRANSFER_AMOUNT:,}')
+
+    # Sub-cent amounts would drift REAL balances away from the cent-rounded
+    # ledger_summary total, so both storage modes take whole cents only
+    if round(amount * 100) / 100 != amount:
+        raise TransferError('Transfer amount must be a whole number of cents')
+
+    return from_account_id, to_account_id, amount
+
+
+def _debit(cursor, account_id, amount, money_scale):
+    """Withdraw amount (in storage units) only if the balance covers it; returns the updated row"""
+    cursor.execute(
+        'UPDATE users SET account_balance = account_balance - ? '
+        'WHERE id = ? AND account_balance >= ? RETURNING id, name, account_balance',
+        (amount, account_id, amount)
+    )
+    row = cursor.fetchone()
+    if row is not None:
+        return row
+
+    # Nothing updated: either the account is missing or funds are short
+    cursor.execute('SELECT account_balance FROM users WHERE id = ?', (account_id,))
+    account = cursor.fetchone()
+    if account is None:
+        raise TransferError(f'Source account {account_id} not found', 404)
+    available = from_stored(account['account_balance'], money_scale)
+    raise TransferError(f'Insufficient funds. Available: ${available:.2f}')
+
+
+def _credit(cursor, account_id, amount):
+    """Deposit amount (in storage units) into an account; returns the updated row"""
+    cursor.execute(
+        'UPDATE users SET account_balance = account_balance + ? WHERE id = ? '
+        'RETURNING id, name, account_balance',
+        (amount, account_id)
+    )
+    row = cursor.fetchone()
+    if row is None:
+        raise TransferError(f'Destination account {account_id} not found', 404)
+    return row
+
+
+def _apply_transfer(cursor, from_account_id, to_account_id, amount):
+    """Debit, credit and record a transfer inside the caller's write transaction"""
+    money_scale = read_money_scale(cursor)
+    stored_amount = to_stored(amount, money_scale)
+
+    if from_account_id < to_account_id:
+        from_row = _debit(cursor, from_account_id, stored_amount, money_scale)
+        to_row = _credit(cursor, to_account_id, stored_amount)
+    else:
+        to_row = _credit(cursor, to_account_id, stored_amount)
+        from_row = _debit(cursor, from_account_id, stored_amount, money_scale)
+
+    cursor.execute('''
+        INSERT INTO transactions
+        (user_id, amount, transaction_type, status, from_account_id, to_account_id)
+        VALUES (?, ?, 'transfer', 'completed', ?, ?)
+    ''', (from_account_id, stored_amount, from_account_id, to_account_id))
+
+    return {
+        'transaction_id': cursor.lastrowid,
+        'from_account': from_row['name'],
+        'to_account': to_row['name'],
+        'accounts': [
+            {
+                'id': row['id'],
+                'name': row['name'],
+                'account_balance': from_stored(row['account_balance'], money_scale),
+            }
+            for row in (from_row, to_row)
+        ],
+    }
+
+
+def execute_transfer(conn, from_account_id, to_account_id, amount):
+    """
+    Move amount between two accounts atomically.
+
+    The write lock is taken up front with BEGIN IMMEDIATE, the funds check
+    is folded into a conditional UPDATE, and the two account rows are
+    always touched in ascending id order, so concurrent transfers can
+    neither overdraw an account nor lose an update.
+
+    Returns a dict with transaction_id, from_account and to_account names,
+    and `accounts`: both accounts with their balances as of this commit,
+    in the same shape as /api/accounts. Raises TransferError (after
+    rolling back) if the transfer is rejected.
+    """
+    cursor = conn.cursor()
+    cursor.execute('BEGIN IMMEDIATE')
+    try:
+        result = _apply_transfer(cursor, from_account_id, to_account_id, amount)
+        cursor.execute('COMMIT')
+    except BaseException:
+        cursor.execute('ROLLBACK')
+        raise
+    return result
+
+
+# Idempotency-Key handling. Completed transfers are stored by key in the
+# idempotency_keys table, in the same transaction that moves the money,
+# and kept for IDEMPOTENCY_RETENTION seconds. Recent results are also held
+# in a per-process LRU cache so most retries are answered without a
+# transaction. Rejected transfers are not stored: they moved nothing, so
+# retrying them is already safe.
+IDEMPOTENCY_RETENTION = 24 * 60 * 60
+IDEMPOTENCY_CACHE_SIZE = 10000
+IDEMPOTENCY_CACHE_TTL = 5 * 60
+IDEMPOTENCY_PURGE_EVERY = 1000
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+class IdempotencyCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds"""
+
+    def __init__(self, max_size=IDEMPOTENCY_CACHE_SIZE, ttl=IDEMPOTENCY_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_idempotency_caches = {}
+_idempotent_inserts = itertools.count(1)
+
+
+def get_idempotency_cache(db_path=None):
+    """Idempotency cache for a database path (defaults to app.config['DATABASE'])"""
+    db_path = db_path or current_app.config['DATABASE']
+    cache = _idempotency_caches.get(db_path)
+    if cache is None:
+        with _pools_lock:
+            cache = _idempotency_caches.setdefault(db_path, IdempotencyCache())
+    return cache
+
+
+def clear_idempotency_caches():
+    """Forget cached results, e.g. after the database was restored"""
+    with _pools_lock:
+        for cache in _idempotency_caches.values():
+            cache.clear()
+
+
+def transfer_fingerprint(from_account_id, to_account_id, amount):
+    """
+    Hash of a transfer request, to detect a key reused for a different transfer.
+
+    The amount is hashed as integer cents, so 100 and 100.0 are the same transfer.
+    """
+    payload = json.dumps([from_account_id, to_account_id, round(amount * 100)])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _check_fingerprint(stored_hash, request_hash):
+    if stored_hash != request_hash:
+        raise TransferError('Idempotency-Key was already used for a different transfer', 422)
+
+
+def execute_idempotent_transfer(conn, cache, key, from_account_id, to_account_id, amount):
+    """
+    Run a transfer at most once per Idempotency-Key.
+
+    Returns (result, replayed). A retry of a completed transfer returns
+    the stored result with replayed=True and leaves account rows alone.
+    Looking the key up after BEGIN IMMEDIATE serializes concurrent retries,
+    so only one of them can move the money. Raises TransferError (422) if
+    the key was used for a different transfer. `cache` is the
+    IdempotencyCache for conn's database.
+    """
+    request_hash = transfer_fingerprint(from_account_id, to_account_id, amount)
+
+    cached = cache.get(key)
+    if cached is not None:
+        _check_fingerprint(cached[0], request_hash)
+        return cached[1], True
+
+    now = time.time()
+    cursor = conn.cursor()
+    cursor.execute('BEGIN IMMEDIATE')
+    try:
+        cursor.execute(
+            'SELECT request_hash, response FROM idempotency_keys WHERE key = ? AND created_on > ?',
+            (key, now - IDEMPOTENCY_RETENTION)
+        )
+        stored = cursor.fetchone()
+        if stored is not None:
+            cursor.execute('COMMIT')
+            _check_fingerprint(stored['request_hash'], request_hash)
+            result = json.loads(stored['response'])
+            cache.put(key, (request_hash, result))
+            return result, True
+
+        result = _apply_transfer(cursor, from_account_id, to_account_id, amount)
+        cursor.execute(
+            'INSERT OR REPLACE INTO idempotency_keys (key, request_hash, response, created_on) '
+            'VALUES (?, ?, ?, ?)',
+            (key, request_hash, json.dumps(result), now)
+        )
+        if next(_idempotent_inserts) % IDEMPOTENCY_PURGE_EVERY == 0:
+            cursor.execute('DELETE FROM idempotency_keys WHERE created_on <= ?',
+                           (now - IDEMPOTENCY_RETENTION,))
+        cursor.execute('COMMIT')
+    except BaseException:
+        if conn.in_transaction:
+            cursor.execute('ROLLBACK')
+        raise
+
+    cache.put(key, (request_hash, result))
+    return result, False
+
+
 @app.route('/api/transfer', methods=['POST'])
 def transfer():
     """
@@ -242,117 +1287,58 @@ def transfer():
         "to_account_id": 2,
         "amount": 100.00
     }
+
+    An optional Idempotency-Key header makes retries safe: repeating a
+    completed transfer with the same key returns the original response
+    (with Idempotent-Replayed: true) instead of moving money again.
     
     Returns:
     {
         "success": true/false,
         "message": "Transfer completed successfully" or error message,
-        "transaction_id": 5 (if successful)
+        "transaction_id": 5 (if successful),
+        "accounts": [{"id": 1, "name": ..., "account_balance": 900.0}, ...] (if successful)
     }
     """
     try:
-        data = request.get_json()
-        
-        # Validate input
-        from_account_id = data.get('from_account_id')
-        to_account_id = data.get('to_account_id')
-        amount = data.get('amount')
-        
-        if not all([from_account_id, to_account_id, amount]):
-            return jsonify({
-                'success': False,
-                'message': 'Missing required fields: from_account_id, to_account_id, amount'
-            }), 400
-        
-        if from_account_id == to_account_id:
-            return jsonify({
-                'success': False,
-                'message': 'Cannot transfer to the same account'
-            }), 400
-        
-        if amount <= 0:
-            return jsonify({
-                'success': False,
-                'message': 'Transfer amount must be greater than zero'
-            }), 400
-        
-        # Connect to database
+        from_account_id, to_account_id, amount = validate_transfer(request.get_json())
+        idempotency_key = request.headers.get('Idempotency-Key')
+
         conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Get source account
-        cursor.execute('SELECT * FROM users WHERE id = ?', (from_account_id,))
-        from_account = cursor.fetchone()
-        
-        if not from_account:
-            conn.close()
-            return jsonify({
-                'success': False,
-                'message': f'Source account {from_account_id} not found'
-            }), 404
-        
-        # Get destination account
-        cursor.execute('SELECT * FROM users WHERE id = ?', (to_account_id,))
-        to_account = cursor.fetchone()
-        
-        if not to_account:
-            conn.close()
-            return jsonify({
-                'success': False,
-                'message': f'Destination account {to_account_id} not found'
-            }), 404
-        
-        # Check sufficient funds
-        if from_account['account_balance'] < amount:
-            conn.close()
-            return jsonify({
-                'success': False,
-                'message': f'Insufficient funds. Available: ${from_account["account_balance"]:.2f}'
-            }), 400
-        
-        # Perform transfer (as a transaction)
-        try:
-            # Update source account (decrease balance)
-            cursor.execute(
-                'UPDATE users SET account_balance = account_balance - ? WHERE id = ?',
-                (amount, from_account_id)
+        replayed = False
+        if idempotency_key is None:
+            result = execute_transfer(conn, from_account_id, to_account_id, amount)
+        elif not 0 < len(idempotency_key) <= MAX_IDEMPOTENCY_KEY_LENGTH:
+            raise TransferError(
+                f'Idempotency-Key must be 1 to {MAX_IDEMPOTENCY_KEY_LENGTH} characters'
             )
-            
-            # Update destination account (increase balance)
-            cursor.execute(
-                'UPDATE users SET account_balance = account_balance + ? WHERE id = ?',
-                (amount, to_account_id)
+        else:
+            result, replayed = execute_idempotent_transfer(
+                conn, get_idempotency_cache(), idempotency_key,
+                from_account_id, to_account_id, amount
             )
-            
-            # Create transaction record
-            cursor.execute('''
-                INSERT INTO transactions 
-                (user_id, amount, transaction_type, status, from_account_id, to_account_id)
-                VALUES (?, ?, 'transfer', 'completed', ?, ?)
-            ''', (from_account_id, amount, from_account_id, to_account_id))
-            
-            transaction_id = cursor.lastrowid
-            
-            # Commit the transaction
-            conn.commit()
-            conn.close()
-            
-            return jsonify({
-                'success': True,
-                'message': f'Transfer of ${amount:.2f} completed successfully',
-                'transaction_id': transaction_id,
-                'from_account': from_account['name'],
-                'to_account': to_account['name']
-            })
-        
-        except Exception as e:
-            conn.rollback()
-            conn.close()
-            return jsonify({
-                'success': False,
-                'message': f'Transfer failed: {str(e)}'
-            }), 500
-    
+
+        response = jsonify({
+            'success': True,
+            'message': f'Transfer of ${amount:.2f} completed successfully',
+            **result
+        })
+        if replayed:
+            response.headers['Idempotent-Replayed'] = 'true'
+        return response
+
+    except TransferError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), e.status_code
+
+    except sqlite3.Error as e:
+        return jsonify({
+            'success': False,
+            'message': f'Transfer failed: {str(e)}'
+        }), 500
+
     except Exception as e:
         return jsonify({
             'success': False,
@@ -360,8 +1346,335 @@ def transfer():
         }), 500
 
 
+BATCH_MODES = ('atomic', 'best_effort')
+MAX_BATCH_SIZE = 10000
+SQLITE_MAX_PARAMS = 900
+
+
+def _load_balances(cursor, account_ids):
+    """Fetch current balances for a set of account ids, chunked to stay under SQLite's parameter limit"""
+    balances = {}
+    account_ids = list(account_ids)
+    for start in range(0, len(account_ids), SQLITE_MAX_PARAMS):
+        chunk = account_ids[start:start + SQLITE_MAX_PARAMS]
+        placeholders = ', '.join('?' * len(chunk))
+        cursor.execute(
+            f'SELECT id, account_balance FROM users WHERE id IN ({placeholders})',
+            chunk
+        )
+        balances.update((row['id'], row['account_balance']) for row in cursor.fetchall())
+    return balances
+
+
+def execute_transfer_batch(conn, transfers, atomic=True):
+    """
+    Apply many validated transfers in one IMMEDIATE transaction.
+
+    `transfers` is a list of (index, from_account_id, to_account_id, amount).
+    Involved balances are read once, each transfer is checked in order
+    against the running balances, and the surviving transfers are written
+    with two executemany calls (balances and transaction records).
+
+    In atomic mode the first rejected transfer raises TransferError and
+    nothing is written. In best-effort mode rejected transfers are skipped.
+
+    Returns a list of per-item result dicts in input order.
+    """
+    cursor = conn.cursor()
+    cursor.execute('BEGIN IMMEDIATE')
+    try:
+        money_scale = read_money_scale(cursor)
+        account_ids = {t[1] for t in transfers} | {t[2] for t in transfers}
+        balances = _load_balances(cursor, account_ids)
+
+        results = []
+        applied = []
+        for index, from_account_id, to_account_id, amount in transfers:
+            amount = to_stored(amount, money_scale)
+            try:
+                if from_account_id not in balances:
+                    raise TransferError(f'Source account {from_account_id} not found', 404)
+                if to_account_id not in balances:
+                    raise TransferError(f'Destination account {to_account_id} not found', 404)
+                if balances[from_account_id] < amount:
+                    available = from_stored(balances[from_account_id], money_scale)
+                    raise TransferError(f'Insufficient funds. Available: ${available:.2f}')
+            except TransferError as e:
+                if atomic:
+                    e.index = index
+                    raise
+                results.append({'index': index, 'success': False, 'message': e.message})
+                continue
+
+            balances[from_account_id] -= amount
+            balances[to_account_id] += amount
+            result = {'index': index, 'success': True}
+            results.append(result)
+            applied.append((result, from_account_id, to_account_id, amount))
+
+        if applied:
+            touched = {a[1] for a in applied} | {a[2] for a in applied}
+            cursor.executemany(
+                'UPDATE users SET account_balance = ? WHERE id = ?',
+                [(balances[account_id], account_id) for account_id in sorted(touched)]
+            )
+
+            # The write lock is held, so ids after the current maximum are ours
+            cursor.execute('SELECT COALESCE(MAX(id), 0) FROM transactions')
+            next_id = cursor.fetchone()[0] + 1
+            rows = []
+            for offset, (result, from_account_id, to_account_id, amount) in enumerate(applied):
+                result['transaction_id'] = next_id + offset
+                rows.append((next_id + offset, from_account_id, amount, from_account_id, to_account_id))
+
+            cursor.executemany('''
+                INSERT INTO transactions
+                (id, user_id, amount, transaction_type, status, from_account_id, to_account_id)
+                VALUES (?, ?, ?, 'transfer', 'completed', ?, ?)
+            ''', rows)
+
+        cursor.execute('COMMIT')
+    except BaseException:
+        cursor.execute('ROLLBACK')
+        raise
+
+    return results
+
+
+def rejected_batch(mode, count, errors):
+    """
+    Response body for an atomic batch that was rolled back.
+
+    Every item gets a result: the rejected ones with their reason, the
+    rest marked as not applied.
+    """
+    first = min(errors)
+    not_applied = f'Not applied: batch rejected at transfer {first}'
+    return {
+        'success': False,
+        'mode': mode,
+        'applied': 0,
+        'failed': count,
+        'results': [
+            {'index': index, 'success': False, 'message': errors.get(index, not_applied)}
+            for index in range(count)
+        ]
+    }
+
+
+@app.route('/api/transfers/batch', methods=['POST'])
+def transfer_batch():
+    """
+    Process many transfers in a single database transaction
+
+    Expected JSON payload (a bare array of transfers is also accepted):
+    {
+        "mode": "atomic" or "best_effort",
+        "transfers": [
+            {"from_account_id": 1, "to_account_id": 2, "amount": 100.00},
+            ...
+        ]
+    }
+
+    Returns:
+    {
+        "success": true/false,
+        "mode": "atomic",
+        "applied": 2,
+        "failed": 0,
+        "results": [
+            {"index": 0, "success": true, "transaction_id": 6},
+            {"index": 1, "success": false, "message": "..."}
+        ]
+    }
+
+    An atomic batch is all or nothing: if any transfer is rejected (by
+    validation or by the ledger) nothing is written, every item is
+    reported as failed, and items that were not themselves rejected say
+    so with "Not applied: batch rejected at transfer N". Ledger checks
+    stop at the first rejected transfer, so later items are not checked.
+    """
+    try:
+        data = request.get_json()
+        if isinstance(data, list):
+            data = {'transfers': data}
+        if not isinstance(data, dict) or not isinstance(data.get('transfers'), list):
+            raise TransferError('Request body must be a JSON array of transfers or {"transfers": [...]}')
+
+        mode = data.get('mode', request.args.get('mode', 'atomic'))
+        if mode not in BATCH_MODES:
+            raise TransferError(f'Unknown mode {mode!r}, expected one of: {", ".join(BATCH_MODES)}')
+        atomic = mode == 'atomic'
+
+        items = data['transfers']
+        if not items:
+            raise TransferError('Batch contains no transfers')
+        if len(items) > MAX_BATCH_SIZE:
+            raise TransferError(f'Batch too large: {len(items)} transfers (max {MAX_BATCH_SIZE})', 413)
+
+        # Validate everything before touching the database
+        valid = []
+        invalid = {}
+        for index, item in enumerate(items):
+            try:
+                valid.append((index, *validate_transfer(item)))
+            except TransferError as e:
+                invalid[index] = e.message
+
+        if invalid and atomic:
+            return jsonify(rejected_batch(mode, len(items), invalid)), 400
+
+        results = []
+        if valid:
+            conn = get_db_connection()
+            try:
+                results = execute_transfer_batch(conn, valid, atomic=atomic)
+            except TransferError as e:
+                return jsonify(rejected_batch(mode, len(items), {e.index: e.message})), e.status_code
+
+        results.extend(
+            {'index': index, 'success': False, 'message': message}
+            for index, message in invalid.items()
+        )
+        results.sort(key=lambda r: r['index'])
+        applied = sum(1 for r in results if r['success'])
+
+        return jsonify({
+            'success': applied == len(results),
+            'mode': mode,
+            'applied': applied,
+            'failed': len(results) - applied,
+            'results': results
+        })
+
+    except TransferError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), e.status_code
+
+    except sqlite3.Error as e:
+        return jsonify({
+            'success': False,
+            'message': f'Batch transfer failed: {str(e)}'
+        }), 500
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error processing request: {str(e)}'
+        }), 500
+
+
+DEFAULT_THREADS = 16
+DEFAULT_BACKLOG = 1024
+KEEP_ALIVE_TIMEOUT = 30
+
+
+def without_keep_alive(wsgi_app):
+    """WSGI middleware that closes the connection after every response"""
+
+    def close_connection(environ, start_response):
+        def start(status, headers, exc_info=None):
+            return start_response(status, headers + [('Connection', 'close')], exc_info)
+        return wsgi_app(environ, start)
+
+    return close_connection
+
+
+def server_options(threads=DEFAULT_THREADS, backlog=DEFAULT_BACKLOG,
+                   keep_alive_timeout=KEEP_ALIVE_TIMEOUT):
+    """waitress settings for the API: worker threads, listen backlog, idle keep-alive timeout"""
+    return {
+        'threads': threads,
+        'backlog': backlog,
+        'channel_timeout': keep_alive_timeout,
+        'connection_limit': max(backlog, 100),
+        'ident': 'bank-api',
+    }
+
+
+def serve(host='127.0.0.1', port=5001, threads=DEFAULT_THREADS, processes=1,
+          backlog=DEFAULT_BACKLOG, keep_alive=True, fd=None):
+    """
+    Serve the API with waitress until interrupted.
+
+    Each process handles requests on a fixed pool of `threads` and keeps
+    HTTP/1.1 connections alive between requests. With processes > 1 the
+    listening socket is bound once and `processes` forked workers accept
+    from it, each with its own threads and database connections (POSIX
+    only). Pass `fd` to serve on an inherited, already-listening socket.
+    """
+    wsgi_app = app if keep_alive else without_keep_alive(app)
+    options = server_options(threads, backlog)
+
+    if fd is not None:
+        listener = socket.socket(fileno=fd)
+    else:
+        listener = socket.create_server((host, port), backlog=backlog)
+
+    if processes <= 1:
+        create_waitress_server(wsgi_app, sockets=[listener], **options).run()
+        return
+
+    workers = []
+    for _ in range(processes):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                create_waitress_server(wsgi_app, sockets=[listener], **options).run()
+            finally:
+                os._exit(0)
+        workers.append(pid)
+
+    def stop_workers(signum, frame):
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop_workers)
+    signal.signal(signal.SIGTERM, stop_workers)
+    for pid in workers:
+        os.waitpid(pid, 0)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Run the banking API server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5001)
+    parser.add_argument('--db', default=DB_PATH, help='SQLite database path')
+    parser.add_argument('--threads', type=int, default=DEFAULT_THREADS,
+                        help='request threads per worker process')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='forked worker processes sharing the listening socket')
+    parser.add_argument('--backlog', type=int, default=DEFAULT_BACKLOG,
+                        help='listen queue length')
+    parser.add_argument('--no-keep-alive', dest='keep_alive', action='store_false',
+                        help='close each connection after one response (HTTP/1.0)')
+    parser.add_argument('--fd', type=int, help='serve on an inherited, already-listening socket')
+    parser.add_argument('--debug', action='store_true',
+                        help='use the single-process Flask development server with the debugger')
+    return parser.parse_args(argv)
+
+
 if __name__ == '__main__':
-    # Run server on port 5001
-    print("Starting Flask server on http://localhost:5001")
-    print("Database path:", DB_PATH)
-    app.run(debug=True, port=5001)
\ No newline at end of file
+    args = parse_args()
+    app.config['DATABASE'] = args.db
+
+    if args.fd is None:
+        print(f"Starting Flask server on http://{args.host}:{args.port}")
+    else:
+        print(f"Starting Flask server on inherited socket fd {args.fd}")
+    print("Database path:", app.config['DATABASE'])
+
+    if args.debug:
+        app.run(debug=True, host=args.host, port=args.port)
+    else:
+        print(f"Workers: {args.processes} process(es) x {args.threads} thread(s), "
+              f"backlog {args.backlog}, keep-alive {'on' if args.keep_alive else 'off'}")
+        serve(args.host, args.port, args.threads, args.processes,
+              args.backlog, args.keep_alive, fd=args.fd)
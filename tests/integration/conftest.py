@@ -2,36 +2,64 @@
 Integration Test Fixtures
 
 Provides fixtures specific to integration testing:
-- db_connection: SQLite database connection
-- flask_server: Flask API server (runs in background thread)
+- test_db_path: Per-session (per xdist worker) database file used by the server
+- template_db: In-memory schema + sample data, built once per session
+- db_connection: SQLite database connection to a fresh copy of the template
+- api_client: In-process Flask test client against fresh data
+- transfer_runner: Seeded stateful transfer runner with shrinking (integer cents)
+- live_server: Flask API server (session-scoped, runs in background thread)
+- flask_server: URL of the live server, reset for each test
 """
 
-import sqlite3
 import os
-import threading
-import time
+import sqlite3
 
 import pytest
 
-from .api_server import app
-from .setup_test_db import create_test_database
+from live_server import LiveServer
+
+from .api_server import DEFAULT_THREADS, app, clear_idempotency_caches, close_pools, server_options
+from .setup_test_db import MONEY_CENTS, create_template_database, populate_database, restore_from_template
+from .transfer_model import TransferRunner
+
+
+@pytest.fixture(scope="session")
+def test_db_path(tmp_path_factory):
+    """Database file private to this session (and so to each xdist worker)"""
+    db_path = str(tmp_path_factory.mktemp('db') / 'test_data.db')
+    yield db_path
+    close_pools()
+
+
+@pytest.fixture(scope="session")
+def template_db():
+    """
+    Builds the schema and sample data once per session.
+
+    Tests never rebuild the database; they get a copy of this template.
+    """
+    template = create_template_database()
+    yield template
+    template.close()
+
 
 @pytest.fixture
-def db_connection():
+def db_connection(template_db, test_db_path):
     """
-    Provides a SQLite database connection for integration tests. 
-    
-    Automatically creates connection before test and closes after. 
+    Provides a SQLite database connection for integration tests.
+
+    Automatically creates connection before test and closes after.
     Uses row_factory for dict-like access to columns.
-    """    
-    # Path to test database
-    db_path = os.path.join('tests', 'test_data.db')
+    """
+    # Restore a fresh copy of the session template (schema + data)
+    restore_from_template(template_db, test_db_path)
+    clear_idempotency_caches()
+
+    # Point the API server at this worker's database
+    app.config['DATABASE'] = test_db_path
 
-    # Create fresh database (handles schema + data)
-    create_test_database(db_path)
-        
     # Create connection
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(test_db_path)
     conn.row_factory = sqlite3.Row
 
     # Provide connection to test
@@ -39,32 +67,72 @@ def db_connection():
 
     # Cleanup: Close connection after test
     conn.close()
-        
+
+
+@pytest.fixture
+def api_client(db_connection):
+    """
+    Flask test client for calling the API in-process (no browser or socket).
+
+    Depends on db_connection so every test starts from fresh sample data.
+    """
+    app.config['TESTING'] = True
+    return app.test_client()
+
+
+@pytest.fixture(scope="session")
+def cents_template_db():
+    """Integer-cents template with the sample accounts plus generated ones"""
+    template = create_template_database(money_scale=MONEY_CENTS)
+    populate_database(template, users=7, seed=0)
+    yield template
+    template.close()
+
+
 @pytest.fixture
-def flask_server():
+def transfer_runner(cents_template_db, test_db_path, db_connection):
+    """
+    Runs seeded transfer sequences in-process and checks ledger invariants
+    after every step; see transfer_model.py.
+
+    Usage:
+        transfers_per_second = transfer_runner.run(seed=1, count=1000)
+    """
+    def reset():
+        restore_from_template(cents_template_db, test_db_path)
+        clear_idempotency_caches()
+
+    return TransferRunner(app.test_client(), db_connection, reset)
+
+
+@pytest.fixture(scope="session")
+def live_server():
     """
-    Starts Flask API server in a background thread for integration testing. 
-    
-    The server runs on http://localhost:5001 during the test,
-    then automatically shuts down after the test completes.
+    Starts the Flask API server once per session in a background thread.
+
+    The server binds to an OS-assigned port and is ready as soon as its
+    socket accepts connections. Per-test state can be restored by
+    registering hooks with live_server.add_reset_hook().
+
+    API_SERVER_THREADS sets the number of request threads (default 16).
     """
-    
     # Configure Flask for testing
-    app.config['Testing'] = True
-    
-    # Start server in a background thread
-    server_thread = threading.Thread(
-        target=lambda: app.run(port=5001, debug=False, use_reloader=False)
-    )
-    server_thread.daemon = True # Thread dies when main program exits
-    server_thread.start()
-    
-    # Wait for server to start (give it 2 seconds)
-    time.sleep(2)
-    
-    # Provide server URL to test
-    yield "http://localhost:5001"
-    
-    # Cleanup: Server automatically stops when thread ends (daemon=True)
-    
-    
\ No newline at end of file
+    app.config['TESTING'] = True
+
+    threads = int(os.getenv('API_SERVER_THREADS', DEFAULT_THREADS))
+    server = LiveServer(app, **server_options(threads=threads)).start()
+    yield server
+
+    # Cleanup: Stop serving and release the port
+    server.stop()
+
+
+@pytest.fixture
+def flask_server(live_server):
+    """
+    Provides the URL of the running Flask API server.
+
+    Runs any registered reset hooks first so each test starts clean.
+    """
+    live_server.reset()
+    yield live_server.url
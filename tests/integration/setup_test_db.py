@@ -1,34 +1,41 @@
 import sqlite3
 import os
+import argparse
+import itertools
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
 
-def create_test_database(db_path='tests/test_data.db'):
+
+# money_scale values: how many stored units make one dollar
+MONEY_DOLLARS = 1    # balances and amounts stored as REAL dollars
+MONEY_CENTS = 100    # balances and amounts stored as INTEGER cents
+
+
+def create_schema(cursor, money_scale=MONEY_DOLLARS):
     """
-    Creates a fresh test database with schema and sample data.
-    Can be called from fixtures or run standalone.
+    Create the users, transactions, idempotency_keys and ledger_summary tables.
+
+    With money_scale=MONEY_CENTS, balances and amounts are stored as
+    integer cents so totals can be compared exactly.
     """
-    # Remove existing database if it exists
-    if os.path.exists(db_path):
-        os.remove(db_path)
-        
-    # Create connection
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    money_type = 'REAL' if money_scale == MONEY_DOLLARS else 'INTEGER'
 
-    # Create tables
-    cursor.execute('''
+    cursor.execute(f'''
                 CREATE TABLE users (
                     id INTEGER PRIMARY KEY,
                     name TEXT NOT NULL,
                     email TEXT NOT NULL,
-                    account_balance REAL NOT NULL
+                    account_balance {money_type} NOT NULL
                 )
                 ''')
 
-    cursor.execute('''
+    cursor.execute(f'''
                 CREATE TABLE transactions (
                     id INTEGER PRIMARY KEY,
                     user_id INTEGER NOT NULL,
-                    amount REAL NOT NULL,
+                    amount {money_type} NOT NULL,
                     transaction_type TEXT NOT NULL,
                     status TEXT NOT NULL,
                     from_account_id INTEGER,
@@ -40,15 +47,77 @@ def create_test_database(db_path='tests/test_data.db'):
                 )
                 ''')
 
-    # Insert test data
+    # Covering indexes for per-account history, newest first: entries an
+    # account made (user_id) and transfers it received (to_account_id),
+    # ordered by the (created_on, id) keyset so pages are index-only.
+    cursor.execute('''
+                CREATE INDEX idx_transactions_user_history ON transactions
+                (user_id, created_on, id, transaction_type, status, amount, from_account_id, to_account_id)
+                ''')
+    cursor.execute('''
+                CREATE INDEX idx_transactions_to_history ON transactions
+                (to_account_id, created_on, id, transaction_type, status, amount, from_account_id, user_id)
+                ''')
+    cursor.execute('CREATE INDEX idx_transactions_from_account ON transactions (from_account_id)')
+
+    # Completed transfers by client Idempotency-Key, so retried requests
+    # replay the stored response instead of moving money again
+    cursor.execute('''
+                CREATE TABLE idempotency_keys (
+                    key TEXT PRIMARY KEY,
+                    request_hash TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_on REAL NOT NULL
+                )
+                ''')
+    cursor.execute('CREATE INDEX idx_idempotency_keys_created_on ON idempotency_keys (created_on)')
+
+    # Single-row summary maintained by triggers on users:
+    # - accounts_version changes whenever any user row changes, giving the
+    #   API a cheap data-version for ETags
+    # - total_cents is the money in the system as exact integer cents, so
+    #   conservation checks are a single-row read instead of a SUM() scan
+    # - money_scale records how balances are stored (see MONEY_* above)
+    cursor.execute('''
+                CREATE TABLE ledger_summary (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    accounts_version INTEGER NOT NULL DEFAULT 0,
+                    total_cents INTEGER NOT NULL DEFAULT 0,
+                    money_scale INTEGER NOT NULL
+                )
+                ''')
+    cursor.execute('INSERT INTO ledger_summary (id, money_scale) VALUES (1, ?)', (money_scale,))
+
+    def cents(column):
+        if money_scale == MONEY_CENTS:
+            return column
+        return f'CAST(ROUND({column} * 100) AS INTEGER)'
+
+    total_change = {
+        'INSERT': cents('NEW.account_balance'),
+        'UPDATE': f"{cents('NEW.account_balance')} - {cents('OLD.account_balance')}",
+        'DELETE': f"-{cents('OLD.account_balance')}",
+    }
+    for event, change in total_change.items():
+        cursor.execute(f'''
+                CREATE TRIGGER users_summary_{event.lower()} AFTER {event} ON users
+                BEGIN
+                    UPDATE ledger_summary
+                    SET accounts_version = accounts_version + 1,
+                        total_cents = total_cents + ({change})
+                    WHERE id = 1;
+                END
+                ''')
+
+
+def insert_seed_data(cursor, money_scale=MONEY_DOLLARS):
+    """Insert the sample users and transactions"""
     users_data = [
         (1, 'John Smith', 'john.smith@example.com', 1000.00),
         (2, 'Jane Doe', 'jane.doe@example.com', 500.00),
         (3, 'Bob Johnson', 'bob.johnson@example.com', 2000.00)
     ]
 
-    cursor.executemany('INSERT INTO users VALUES (?, ?, ?, ?)', users_data)
-
     transactions_data = [
         (1, 1, 500.00, 'deposit', 'completed', None, None),
         (2, 1, 200.00, 'withdrawal', 'completed', None, None),
@@ -57,24 +126,325 @@ def create_test_database(db_path='tests/test_data.db'):
         (5, 3, 2000.00, 'deposit', 'completed', None, None)
     ]
 
+    if money_scale != MONEY_DOLLARS:
+        users_data = [(*user[:3], round(user[3] * money_scale)) for user in users_data]
+        transactions_data = [
+            (*txn[:2], round(txn[2] * money_scale), *txn[3:]) for txn in transactions_data
+        ]
+
+    cursor.executemany('INSERT INTO users VALUES (?, ?, ?, ?)', users_data)
+
     cursor.executemany('''
         INSERT INTO transactions (id, user_id, amount, transaction_type, status, from_account_id, to_account_id)
         VALUES (?, ?, ?, ?, ?, ?, ?)
     ''', transactions_data)
 
+
+def create_test_database(db_path='tests/test_data.db', money_scale=MONEY_DOLLARS):
+    """
+    Creates a fresh test database with schema and sample data.
+    Can be called from fixtures or run standalone.
+    """
+    # Remove existing database if it exists
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    # Create connection
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    create_schema(cursor, money_scale)
+    insert_seed_data(cursor, money_scale)
+
     # Commit and close
     conn.commit()
     conn.close()
-    
+
     return db_path
 
-    if __name__ == '__main__':
-        print(f"Test database created successfully at: {db_path}")
-        print("Tables created: users, transactions")
-        print(f"Users inserted: {len(users_data)}")
-        print(f"Transactions inserted: {len(transactions_data)}")
-        print("\nInitial account balances:")
-        print("  John Smith: $1000.00")
-        print("  Jane Doe: $500.00")
-        print("  Bob Johnson: $2000.00")
-        print("  TOTAL SYSTEM: $3500.00")
\ No newline at end of file
+
+def create_template_database(money_scale=MONEY_DOLLARS):
+    """
+    Builds the schema and sample data once into an in-memory database.
+
+    The returned connection is a template: copy it into the real test
+    database with restore_from_template() instead of rebuilding.
+    """
+    template = sqlite3.connect(':memory:', check_same_thread=False)
+    cursor = template.cursor()
+
+    create_schema(cursor, money_scale)
+    insert_seed_data(cursor, money_scale)
+
+    template.commit()
+    return template
+
+
+def restore_from_template(template, db_path='tests/test_data.db'):
+    """
+    Overwrites db_path with a page-level copy of the template database.
+
+    Uses the sqlite3 backup API: no SQL is replayed, but every page is
+    copied, so the cost is linear in the template's size on disk (about a
+    millisecond for the seed data, most of a second for a 200 MB
+    template). The file is replaced under SQLite's own locking, so open
+    connections see the new contents.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        template.backup(conn)
+    finally:
+        conn.close()
+
+    return db_path
+
+
+# Synthetic data for scale testing. Rows are generated lazily from a
+# seeded RNG, so the same arguments always produce the same database and
+# millions of rows never sit in memory at once.
+DEFAULT_CHUNK_SIZE = 50000
+GENERATED_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+TRANSACTION_MIX = (('transfer', 50), ('deposit', 30), ('withdrawal', 20))
+STATUS_MIX = (('completed', 95), ('pending', 4), ('failed', 1))
+
+# Pragmas for loading into a database nobody else is using; a crash
+# mid-load can corrupt it, which is fine for generated test data
+BULK_LOAD_PRAGMAS = {
+    'journal_mode': 'OFF',
+    'synchronous': 'OFF',
+    'cache_size': -256000,  # KiB
+    'temp_store': 'MEMORY',
+    'threads': 4,  # Worker threads for the sorts behind CREATE INDEX
+}
+
+
+def generate_users(count, seed=0, money_scale=MONEY_DOLLARS, start_id=1):
+    """Yield (id, name, email, account_balance) rows with balances from $100 to $10,000"""
+    draw = random.Random(f'users-{seed}').random
+    for user_id in range(start_id, start_id + count):
+        cents = 10000 + int(draw() * 990001)
+        balance = cents if money_scale == MONEY_CENTS else cents / 100
+        yield user_id, f'User {user_id}', f'user{user_id}@example.com', balance
+
+
+def _weighted_table(mix):
+    """Expand (value, weight) pairs into a list to index with a uniform draw"""
+    return [value for value, weight in mix for _ in range(weight)]
+
+
+def generate_transactions(count, account_count, seed=0, money_scale=MONEY_DOLLARS,
+                          start_id=1, first_account=1, interval_seconds=60):
+    """
+    Yield transactions rows spread over account_count accounts numbered
+    from first_account.
+
+    Entries are `interval_seconds` apart from 2024-01-01 in id order, so
+    history pages have realistic, strictly increasing timestamps. This is
+    the hot loop of a large load, so each field costs one rng.random().
+    """
+    rng = random.Random(f'transactions-{seed}')
+    draw = rng.random
+    types = _weighted_table(TRANSACTION_MIX)
+    statuses = _weighted_table(STATUS_MIX)
+    start = GENERATED_START.timestamp()
+    dates = {}
+
+    for transaction_id in range(start_id, start_id + count):
+        transaction_type = types[int(draw() * len(types))]
+        status = statuses[int(draw() * len(statuses))]
+        offset = int(draw() * account_count)
+        user_id = first_account + offset
+        cents = 100 + int(draw() * 99901)
+        amount = cents if money_scale == MONEY_CENTS else cents / 100
+
+        from_account_id = to_account_id = None
+        if transaction_type == 'transfer' and account_count > 1:
+            # Any other account: draw from the remaining ones and skip ourselves
+            other = int(draw() * (account_count - 1))
+            from_account_id = user_id
+            to_account_id = first_account + (other + 1 if other >= offset else other)
+
+        # Format the date once per day, the time of day arithmetically
+        day, second = divmod(int(start) + (transaction_id - start_id) * interval_seconds, 86400)
+        date = dates.get(day)
+        if date is None:
+            date = dates[day] = datetime.fromtimestamp(day * 86400, timezone.utc).strftime('%Y-%m-%d')
+        hour, second = divmod(second, 3600)
+        minute, second = divmod(second, 60)
+        created_on = f'{date} {hour:02d}:{minute:02d}:{second:02d}'
+
+        yield (transaction_id, user_id, amount, transaction_type, status,
+               from_account_id, to_account_id, created_on)
+
+
+def insert_chunked(cursor, sql, rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """executemany() rows from an iterable chunk_size at a time; returns the row count"""
+    rows = iter(rows)
+    inserted = 0
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return inserted
+        cursor.executemany(sql, chunk)
+        inserted += len(chunk)
+
+
+@contextmanager
+def bulk_load(conn, tables=('users', 'transactions')):
+    """
+    Make `conn` fast to load for the duration of the block.
+
+    Sets BULK_LOAD_PRAGMAS and drops the indexes and triggers on `tables`,
+    then recreates them and restores the previous pragma values. Building
+    an index once over sorted data is far cheaper than maintaining it row
+    by row, and the ledger_summary triggers would fire for every insert,
+    so the summary is recomputed once afterwards instead.
+
+    The recompute also runs when the block raises. journal_mode=OFF cannot
+    roll back, so rows loaded before the error stay, and the summary has
+    to match them before the triggers take over again.
+    """
+    cursor = conn.cursor()
+    previous = {name: cursor.execute(f'PRAGMA {name}').fetchone()[0] for name in BULK_LOAD_PRAGMAS}
+    placeholders = ', '.join('?' for _ in tables)
+    deferred = cursor.execute(f'''
+        SELECT type, name, sql FROM sqlite_master
+        WHERE type IN ('index', 'trigger') AND tbl_name IN ({placeholders}) AND sql IS NOT NULL
+    ''', tables).fetchall()
+
+    conn.commit()
+    for name, value in BULK_LOAD_PRAGMAS.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+    for object_type, name, _ in deferred:
+        cursor.execute(f'DROP {object_type.upper()} {name}')
+
+    try:
+        yield cursor
+    finally:
+        conn.commit()
+        if 'users' in tables:
+            refresh_ledger_summary(cursor)
+            conn.commit()
+        for _, _, sql in deferred:
+            cursor.execute(sql)
+        conn.commit()
+        for name, value in previous.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def refresh_ledger_summary(cursor):
+    """Recompute total_cents from users and bump accounts_version"""
+    money_scale = cursor.execute('SELECT money_scale FROM ledger_summary WHERE id = 1').fetchone()[0]
+    balance_cents = 'account_balance'
+    if money_scale != MONEY_CENTS:
+        balance_cents = 'CAST(ROUND(account_balance * 100) AS INTEGER)'
+    cursor.execute(f'''
+        UPDATE ledger_summary
+        SET accounts_version = accounts_version + 1,
+            total_cents = (SELECT COALESCE(SUM({balance_cents}), 0) FROM users)
+        WHERE id = 1
+    ''')
+
+
+def populate_database(conn, users, transactions=0, seed=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Append `users` generated accounts and `transactions` generated history
+    entries to a database created with create_schema().
+
+    Ids continue after any existing rows, and generated transactions
+    reference only the generated accounts. Returns a dict with the row
+    counts and the seconds taken.
+    """
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    money_scale = cursor.execute('SELECT money_scale FROM ledger_summary WHERE id = 1').fetchone()[0]
+    first_user = cursor.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM users').fetchone()[0]
+    first_transaction = cursor.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM transactions').fetchone()[0]
+
+    # Explicit transactions, so rows are not committed one by one even on
+    # connections in autocommit mode (isolation_level=None)
+    with bulk_load(conn) as cursor:
+        cursor.execute('BEGIN')
+        inserted_users = insert_chunked(
+            cursor,
+            'INSERT INTO users VALUES (?, ?, ?, ?)',
+            generate_users(users, seed, money_scale, first_user),
+            chunk_size,
+        )
+        conn.commit()
+
+        cursor.execute('BEGIN')
+        inserted_transactions = insert_chunked(
+            cursor,
+            '''
+            INSERT INTO transactions
+            (id, user_id, amount, transaction_type, status, from_account_id, to_account_id, created_on)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''',
+            generate_transactions(transactions, users, seed, money_scale,
+                                  start_id=first_transaction, first_account=first_user),
+            chunk_size,
+        )
+
+    return {
+        'users': inserted_users,
+        'transactions': inserted_transactions,
+        'seconds': time.perf_counter() - started,
+    }
+
+
+def create_scale_database(db_path, users, transactions=0, seed=0,
+                          money_scale=MONEY_DOLLARS, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Creates a fresh database holding only generated data.
+    Can be called from fixtures or run standalone (see --users below).
+    """
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        create_schema(conn.cursor(), money_scale)
+        conn.commit()
+        stats = populate_database(conn, users, transactions, seed, chunk_size)
+    finally:
+        conn.close()
+
+    return stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Create the test database')
+    parser.add_argument('--db', default='tests/test_data.db', help='SQLite database path')
+    parser.add_argument('--users', type=int, help='generate this many accounts instead of the sample data')
+    parser.add_argument('--transactions', type=int, default=0, help='generated transaction history entries')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for generated data')
+    parser.add_argument('--cents', action='store_true', help='store money as integer cents')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='rows per executemany()')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    money_scale = MONEY_CENTS if args.cents else MONEY_DOLLARS
+
+    if args.users is not None:
+        stats = create_scale_database(
+            args.db, args.users, args.transactions, args.seed, money_scale, args.chunk_size
+        )
+        print(f"Scale database created successfully at: {args.db}")
+        print(f"Users inserted: {stats['users']}")
+        print(f"Transactions inserted: {stats['transactions']}")
+        print(f"Seed: {args.seed}, loaded in {stats['seconds']:.2f}s")
+        raise SystemExit(0)
+
+    db_path = create_test_database(args.db, money_scale)
+    print(f"Test database created successfully at: {db_path}")
+    print("Tables created: users, transactions")
+    print("Users inserted: 3")
+    print("Transactions inserted: 5")
+    print("\nInitial account balances:")
+    print("  John Smith: $1000.00")
+    print("  Jane Doe: $500.00")
+    print("  Bob Johnson: $2000.00")
+    print("  TOTAL SYSTEM: $3500.00")
@@ -0,0 +1,48 @@
+"""
+API Tests: Accounts Endpoint
+
+Validates keyset pagination, field projection and conditional GETs on /api/accounts.
+"""
+
+
+def test_accounts_keyset_pagination(api_client):
+    first = api_client.get('/api/accounts?limit=2')
+    assert first.status_code == 200
+    assert [a['id'] for a in first.get_json()] == [1, 2]
+    assert first.headers['X-Next-Cursor'] == '2'
+    assert 'after=2' in first.headers['Link']
+
+    second = api_client.get('/api/accounts?limit=2&after=2')
+    assert [a['id'] for a in second.get_json()] == [3]
+    assert 'X-Next-Cursor' not in second.headers
+
+
+def test_accounts_rejects_out_of_range_cursor(api_client):
+    for query in ('after=' + '9' * 20, 'after=-1', 'limit=' + '9' * 20):
+        response = api_client.get(f'/api/accounts?{query}')
+        assert response.status_code == 400, query
+        assert 'must be between' in response.get_json()['message']
+
+
+def test_accounts_field_projection(api_client):
+    response = api_client.get('/api/accounts?fields=name,account_balance')
+    assert response.get_json()[0] == {'name': 'John Smith', 'account_balance': 1000.0}
+
+    response = api_client.get('/api/accounts?fields=password')
+    assert response.status_code == 400
+
+
+def test_accounts_etag_changes_only_with_data(api_client):
+    first = api_client.get('/api/accounts')
+    etag = first.headers['ETag']
+
+    unchanged = api_client.get('/api/accounts', headers={'If-None-Match': etag})
+    assert unchanged.status_code == 304
+    assert unchanged.data == b''
+
+    api_client.post('/api/transfer', json={'from_account_id': 1, 'to_account_id': 2, 'amount': 10})
+
+    changed = api_client.get('/api/accounts', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert changed.get_json()[0]['account_balance'] == 990.0
@@ -0,0 +1,40 @@
+"""
+Concurrency Integration Test: Many Browser Users
+
+Twenty simulated users submit the transfer form at the same time from
+one browser process, then the database is checked for lost updates.
+"""
+
+import pytest
+
+USERS = 20
+TRANSFER_AMOUNT = 10
+
+
+def test_concurrent_ui_transfers(virtual_users, db_connection, flask_server):
+    cursor = db_connection.cursor()
+    cursor.execute("SELECT total_cents FROM ledger_summary")
+    total_before = cursor.fetchone()['total_cents']
+
+    async def transfer_flow(page, user_id):
+        await page.goto(flask_server)
+        await page.wait_for_selector('#transfer-form[data-ready]', state='attached')
+        await page.select_option('[data-testid="from-account-select"]', '1')
+        await page.select_option('[data-testid="to-account-select"]', '2')
+        await page.fill('[data-testid="amount-input"]', str(TRANSFER_AMOUNT))
+        await page.click('[data-testid="transfer-submit-button"]')
+        await page.wait_for_selector('[data-testid="transfer-result"]', state='visible')
+        return await page.text_content('[data-testid="transfer-result"]')
+
+    results = virtual_users(transfer_flow, users=USERS, concurrency=10)
+
+    assert all('success' in text.lower() for text in results)
+
+    cursor.execute("SELECT account_balance FROM users WHERE id = 1")
+    assert cursor.fetchone()['account_balance'] == pytest.approx(1000 - USERS * TRANSFER_AMOUNT)
+
+    cursor.execute("SELECT account_balance FROM users WHERE id = 2")
+    assert cursor.fetchone()['account_balance'] == pytest.approx(500 + USERS * TRANSFER_AMOUNT)
+
+    cursor.execute("SELECT total_cents FROM ledger_summary")
+    assert cursor.fetchone()['total_cents'] == total_before
@@ -0,0 +1,93 @@
+"""
+API Tests: Idempotent Transfers
+
+Validates that retried transfers carrying an Idempotency-Key move money
+once, whether the retry is answered from the in-process cache, from the
+persisted table, or races the original request.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from .api_server import IdempotencyCache, app, clear_idempotency_caches
+
+TRANSFER = {'from_account_id': 1, 'to_account_id': 2, 'amount': 100}
+
+
+def balance(db_connection, account_id):
+    return db_connection.execute(
+        'SELECT account_balance FROM users WHERE id = ?', (account_id,)
+    ).fetchone()[0]
+
+
+def test_retry_replays_without_moving_money(api_client, db_connection):
+    headers = {'Idempotency-Key': 'retry-1'}
+    first = api_client.post('/api/transfer', json=TRANSFER, headers=headers)
+    assert first.status_code == 200
+    assert 'Idempotent-Replayed' not in first.headers
+
+    from_cache = api_client.post('/api/transfer', json=TRANSFER, headers=headers)
+    clear_idempotency_caches()
+    from_table = api_client.post('/api/transfer', json=TRANSFER, headers=headers)
+
+    for replay in (from_cache, from_table):
+        assert replay.status_code == 200
+        assert replay.headers['Idempotent-Replayed'] == 'true'
+        assert replay.get_json() == first.get_json()
+
+    assert balance(db_connection, 1) == pytest.approx(900.00)
+    transfers = db_connection.execute(
+        "SELECT COUNT(*) FROM transactions WHERE transaction_type = 'transfer'"
+    ).fetchone()[0]
+    assert transfers == 1
+
+
+def test_key_reused_for_different_transfer(api_client, db_connection):
+    headers = {'Idempotency-Key': 'reused'}
+    assert api_client.post('/api/transfer', json=TRANSFER, headers=headers).status_code == 200
+
+    response = api_client.post('/api/transfer', json={**TRANSFER, 'amount': 5}, headers=headers)
+    assert response.status_code == 422
+    assert balance(db_connection, 1) == pytest.approx(900.00)
+
+
+def test_retry_with_equivalent_amount_replays(api_client, db_connection):
+    headers = {'Idempotency-Key': 'float-retry'}
+    first = api_client.post('/api/transfer', json=TRANSFER, headers=headers)
+    retry = api_client.post('/api/transfer', json={**TRANSFER, 'amount': 100.0}, headers=headers)
+
+    assert retry.status_code == 200
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert retry.get_json() == first.get_json()
+    assert balance(db_connection, 1) == pytest.approx(900.00)
+
+
+def test_concurrent_retries_move_money_once(api_client, db_connection):
+    def send(_):
+        client = app.test_client()
+        response = client.post('/api/transfer', json=TRANSFER, headers={'Idempotency-Key': 'race'})
+        return response.status_code, response.get_json()['transaction_id']
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(send, range(16)))
+
+    assert {status for status, _ in results} == {200}
+    assert len({transaction_id for _, transaction_id in results}) == 1
+    assert balance(db_connection, 1) == pytest.approx(900.00)
+    assert balance(db_connection, 2) == pytest.approx(600.00)
+
+
+def test_cache_evicts_least_recent_and_expired(monkeypatch):
+    cache = IdempotencyCache(max_size=2, ttl=10)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert len(cache) == 2
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 11)
+    assert cache.get('a') is None
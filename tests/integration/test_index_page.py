@@ -0,0 +1,66 @@
+"""
+API Tests: Server-rendered Transfer Page
+
+Validates that the transfer page arrives with the accounts already in
+both dropdowns and the account list, marked ready, and that its ETag
+follows the accounts data.
+"""
+
+import re
+
+from . import api_server
+
+
+def test_index_page_renders_accounts(api_client, db_connection):
+    response = api_client.get('/')
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+
+    assert '<form id="transfer-form" data-ready="true">' in html
+    assert 'data-next-cursor' not in html
+    for row in db_connection.execute('SELECT id, name, account_balance FROM users'):
+        option = f'<option value="{row["id"]}">{row["name"]} - ${row["account_balance"]:.2f}</option>'
+        assert html.count(option) == 2  # from and to dropdowns
+        assert f'<div data-account-id="{row["id"]}">{row["name"]}: ${row["account_balance"]:.2f}</div>' in html
+
+
+def test_index_page_escapes_account_names(api_client, db_connection):
+    db_connection.execute(
+        "INSERT INTO users (name, email, account_balance) VALUES ('<b>Eve</b> & Co', 'eve@example.com', 5)"
+    )
+    db_connection.commit()
+
+    html = api_client.get('/').get_data(as_text=True)
+    assert '&lt;b&gt;Eve&lt;/b&gt; &amp; Co: $5.00' in html
+    assert '<b>Eve</b>' not in html
+
+
+def test_index_page_etag_follows_accounts(api_client):
+    first = api_client.get('/')
+    etag = first.headers['ETag']
+    assert api_client.get('/', headers={'If-None-Match': etag}).status_code == 304
+
+    transfer = api_client.post('/api/transfer', json={'from_account_id': 1, 'to_account_id': 2, 'amount': 10})
+    assert transfer.status_code == 200
+
+    after = api_client.get('/', headers={'If-None-Match': etag})
+    assert after.status_code == 200
+    assert after.headers['ETag'] != etag
+    balance = next(account['account_balance'] for account in transfer.get_json()['accounts']
+                   if account['id'] == 1)
+    assert re.search(rf'<option value="1">[^<]+ - \${balance:.2f}</option>', after.get_data(as_text=True))
+
+
+def test_index_page_leaves_large_lists_to_the_client(api_client, db_connection, monkeypatch):
+    monkeypatch.setattr(api_server, 'INDEX_ACCOUNTS_LIMIT', 2)
+    html = api_client.get('/').get_data(as_text=True)
+    assert '<div id="accounts-list" data-next-cursor="2">' in html
+    assert 'data-account-id="2"' in html
+    assert 'data-account-id="3"' not in html
+    # Not ready until the client has appended the rest from the cursor
+    assert '<form id="transfer-form">' in html
+    assert 'data-ready' not in html.split('<script>')[0]
+    assert 'loadAccounts(nextCursor)' in html
+
+    rest = api_client.get('/api/accounts?fields=id,name,account_balance&limit=1000&after=2').get_json()
+    assert [account['id'] for account in rest] == [3]
@@ -0,0 +1,68 @@
+"""
+Database Tests: Ledger Summary
+
+Validates that the trigger-maintained system total stays exact, for both
+REAL-dollar and integer-cent storage.
+"""
+
+from .setup_test_db import MONEY_CENTS, create_template_database, restore_from_template
+
+
+def system_total(db_connection):
+    return db_connection.execute('SELECT total_cents FROM ledger_summary').fetchone()[0]
+
+
+def test_total_matches_seed_data(db_connection):
+    assert system_total(db_connection) == 350000
+
+    scanned = db_connection.execute('SELECT SUM(account_balance) FROM users').fetchone()[0]
+    assert system_total(db_connection) == round(scanned * 100)
+
+
+def test_total_conserved_across_transfers(api_client, db_connection):
+    api_client.post('/api/transfer', json={'from_account_id': 1, 'to_account_id': 2, 'amount': 0.1})
+    api_client.post('/api/transfer', json={'from_account_id': 2, 'to_account_id': 3, 'amount': 0.2})
+    api_client.post('/api/transfers/batch', json=[
+        {'from_account_id': 3, 'to_account_id': 1, 'amount': 33.33},
+        {'from_account_id': 1, 'to_account_id': 2, 'amount': 66.67},
+    ])
+
+    assert system_total(db_connection) == 350000
+
+
+def test_sub_cent_transfers_rejected(api_client, db_connection):
+    """Rounding each sub-cent transfer to cents would let total_cents drift from SUM()"""
+    for amount in (0.005, 0.005, 0.015, 10.001):
+        response = api_client.post('/api/transfer', json={
+            'from_account_id': 1, 'to_account_id': 2, 'amount': amount
+        })
+        assert response.status_code == 400
+        assert 'whole number of cents' in response.get_json()['message']
+
+    scanned = db_connection.execute('SELECT SUM(account_balance) FROM users').fetchone()[0]
+    assert scanned == 3500.0
+    assert system_total(db_connection) == 350000
+
+
+def test_integer_cents_storage(api_client, db_connection, test_db_path):
+    template = create_template_database(money_scale=MONEY_CENTS)
+    restore_from_template(template, test_db_path)
+    template.close()
+
+    response = api_client.post('/api/transfer', json={
+        'from_account_id': 1, 'to_account_id': 2, 'amount': 12.34
+    })
+    assert response.status_code == 200
+
+    balances = db_connection.execute('SELECT account_balance FROM users ORDER BY id').fetchall()
+    assert [row[0] for row in balances] == [98766, 51234, 200000]
+    assert system_total(db_connection) == 350000
+
+    accounts = api_client.get('/api/accounts').get_json()
+    assert accounts[0]['account_balance'] == 987.66
+
+    response = api_client.post('/api/transfer', json={
+        'from_account_id': 2, 'to_account_id': 1, 'amount': 512.35
+    })
+    assert response.status_code == 400
+    assert 'Available: $512.34' in response.get_json()['message']
@@ -0,0 +1,67 @@
+"""
+API Tests: Prometheus Metrics
+
+Validates that /metrics reports request latency, status counts and the
+SQL statements each endpoint issued. Metrics are process-wide, so the
+tests compare counts before and after their own requests.
+"""
+
+import re
+
+
+def sample(text, name, **labels):
+    """Value of one sample in Prometheus text output (0 if absent)"""
+    for line in text.splitlines():
+        match = re.match(r'^(\w+)(?:\{(.*)\})? (\S+)$', line)
+        if not match or match.group(1) != name:
+            continue
+        found = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', match.group(2) or ''))
+        if all(found.get(key) == value for key, value in labels.items()):
+            return float(match.group(3))
+    return 0.0
+
+
+def metrics(api_client):
+    response = api_client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    return response.get_data(as_text=True)
+
+
+def test_metrics_count_requests_by_status(api_client):
+    before = metrics(api_client)
+    api_client.get('/api/accounts')
+    api_client.post('/api/transfer', json={'from_account_id': 1, 'to_account_id': 999, 'amount': 1})
+    after = metrics(api_client)
+
+    ok = dict(name='http_responses_total', method='GET', endpoint='get_accounts', status='200')
+    not_found = dict(name='http_responses_total', method='POST', endpoint='transfer', status='404')
+    assert sample(after, **ok) == sample(before, **ok) + 1
+    assert sample(after, **not_found) == sample(before, **not_found) + 1
+
+    latency = dict(name='http_request_duration_seconds_count', method='GET', endpoint='get_accounts')
+    assert sample(after, **latency) == sample(before, **latency) + 1
+    assert sample(after, 'http_request_duration_seconds_bucket',
+                  endpoint='get_accounts', le='+Inf') == sample(after, **latency)
+    assert sample(after, 'http_requests_in_flight') == 1  # the /metrics request itself
+
+
+def test_metrics_time_transfer_queries(api_client):
+    before = metrics(api_client)
+    response = api_client.post('/api/transfer', json={'from_account_id': 1, 'to_account_id': 2, 'amount': 10})
+    assert response.status_code == 200
+    after = metrics(api_client)
+
+    debit = dict(
+        name='sqlite_query_duration_seconds_count',
+        endpoint='transfer',
+        query='UPDATE users SET account_balance = account_balance - ? '
+              'WHERE id = ? AND account_balance >= ? RETURNING id, name, account_balance',
+    )
+    assert sample(after, **debit) == sample(before, **debit) + 1
+    assert sample(after, 'sqlite_query_duration_seconds_sum', **{
+        key: value for key, value in debit.items() if key != 'name'
+    }) > 0
+
+    queries = dict(name='http_request_sqlite_queries_count', endpoint='transfer')
+    assert sample(after, **queries) == sample(before, **queries) + 1
@@ -0,0 +1,51 @@
+"""
+API Tests: Response Caching and Compression
+
+Validates ETag revalidation of the transfer page and gzip/deflate
+negotiation for HTML and JSON responses.
+"""
+
+import gzip
+import json
+import zlib
+
+
+def test_index_page_revalidates_with_etag(api_client):
+    first = api_client.get('/')
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'no-cache'
+    assert b'Bank Transfer' in first.data
+
+    second = api_client.get('/', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 304
+    assert second.data == b''
+
+
+def test_index_page_is_compressed_when_accepted(api_client):
+    plain = api_client.get('/')
+    assert 'Content-Encoding' not in plain.headers
+
+    gzipped = api_client.get('/', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert gzipped.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in gzipped.headers['Vary']
+    assert gzip.decompress(gzipped.data) == plain.data
+
+    deflated = api_client.get('/', headers={'Accept-Encoding': 'deflate'})
+    assert deflated.headers['Content-Encoding'] == 'deflate'
+    assert zlib.decompress(deflated.data) == plain.data
+
+
+def test_json_compressed_above_threshold(api_client, db_connection):
+    small = api_client.get('/api/accounts', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
+
+    db_connection.executemany(
+        'INSERT INTO users (name, email, account_balance) VALUES (?, ?, ?)',
+        [(f'User {i}', f'user{i}@example.com', 100.0) for i in range(50)]
+    )
+    db_connection.commit()
+
+    large = api_client.get('/api/accounts', headers={'Accept-Encoding': 'gzip'})
+    assert large.headers['Content-Encoding'] == 'gzip'
+    accounts = json.loads(gzip.decompress(large.data))
+    assert len(accounts) == 53
@@ -0,0 +1,94 @@
+"""
+Database Tests: Synthetic Scale Data
+
+Validates the seeded generator behind create_scale_database(): the same
+seed gives the same rows, the ledger summary matches the generated
+balances, and the bulk-load shortcuts are undone afterwards.
+"""
+
+import sqlite3
+
+import pytest
+
+from .setup_test_db import (
+    MONEY_CENTS, bulk_load, create_scale_database, create_schema, generate_transactions,
+    insert_chunked, populate_database,
+)
+
+SCHEMA_OBJECTS = "SELECT type, name FROM sqlite_master WHERE type IN ('index', 'trigger') ORDER BY name"
+
+
+def test_same_seed_same_rows(tmp_path):
+    paths = [tmp_path / 'a.db', tmp_path / 'b.db']
+    for path in paths:
+        create_scale_database(str(path), users=500, transactions=2000, seed=7, chunk_size=300)
+
+    dumps = []
+    for path in paths:
+        conn = sqlite3.connect(path)
+        dumps.append((
+            conn.execute('SELECT * FROM users ORDER BY id').fetchall(),
+            conn.execute('SELECT * FROM transactions ORDER BY id').fetchall(),
+        ))
+        conn.close()
+    assert dumps[0] == dumps[1]
+    assert len(dumps[0][0]) == 500
+    assert len(dumps[0][1]) == 2000
+
+
+def test_generated_transfers_stay_within_accounts():
+    for row in generate_transactions(5000, account_count=10, first_account=21):
+        _, user_id, _, transaction_type, _, from_account_id, to_account_id, _ = row
+        assert 21 <= user_id <= 30
+        if transaction_type == 'transfer':
+            assert from_account_id == user_id
+            assert 21 <= to_account_id <= 30 and to_account_id != user_id
+
+
+def test_populate_keeps_summary_and_schema(tmp_path):
+    conn = sqlite3.connect(tmp_path / 'scale.db')
+    create_schema(conn.cursor(), MONEY_CENTS)
+    conn.execute("INSERT INTO users VALUES (1, 'Existing', 'existing@example.com', 12345)")
+    conn.commit()
+    conn.execute('PRAGMA journal_mode = WAL')
+    objects_before = conn.execute(SCHEMA_OBJECTS).fetchall()
+
+    stats = populate_database(conn, users=1000, transactions=3000, chunk_size=256)
+
+    assert stats['users'] == 1000 and stats['transactions'] == 3000
+    assert conn.execute(SCHEMA_OBJECTS).fetchall() == objects_before
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert conn.execute('PRAGMA synchronous').fetchone()[0] == 2  # FULL, the default
+
+    total, = conn.execute('SELECT SUM(account_balance) FROM users').fetchone()
+    assert conn.execute('SELECT total_cents FROM ledger_summary').fetchone()[0] == total
+    assert conn.execute('SELECT MIN(user_id) FROM transactions').fetchone()[0] >= 2
+
+    # Triggers are back: later changes keep the summary exact
+    conn.execute('UPDATE users SET account_balance = account_balance + 5 WHERE id = 1')
+    conn.commit()
+    assert conn.execute('SELECT total_cents FROM ledger_summary').fetchone()[0] == total + 5
+    conn.close()
+
+
+def test_failed_load_leaves_summary_exact(tmp_path):
+    conn = sqlite3.connect(tmp_path / 'scale.db')
+    create_schema(conn.cursor(), MONEY_CENTS)
+    objects_before = conn.execute(SCHEMA_OBJECTS).fetchall()
+
+    def rows():
+        for user_id in range(1, 101):
+            yield user_id, f'User {user_id}', f'user{user_id}@example.com', 1000
+        raise RuntimeError('generator failed')
+
+    with pytest.raises(RuntimeError):
+        with bulk_load(conn) as cursor:
+            cursor.execute('BEGIN')
+            insert_chunked(cursor, 'INSERT INTO users VALUES (?, ?, ?, ?)', rows(), chunk_size=30)
+
+    # The chunks inserted before the error stay, and the summary counts them
+    total, = conn.execute('SELECT SUM(account_balance) FROM users').fetchone()
+    assert total == 90 * 1000
+    assert conn.execute('SELECT total_cents FROM ledger_summary').fetchone()[0] == total
+    assert conn.execute(SCHEMA_OBJECTS).fetchall() == objects_before
+    conn.close()
@@ -0,0 +1,48 @@
+"""
+API Tests: Transaction History Endpoint
+
+Validates newest-first keyset pagination and filters on
+/api/accounts/<id>/transactions.
+"""
+
+
+def test_history_includes_sent_and_received_transfers(api_client):
+    api_client.post('/api/transfer', json={'from_account_id': 1, 'to_account_id': 2, 'amount': 50})
+    api_client.post('/api/transfer', json={'from_account_id': 3, 'to_account_id': 1, 'amount': 75})
+
+    response = api_client.get('/api/accounts/1/transactions')
+    assert response.status_code == 200
+    data = response.get_json()
+
+    # Ties on created_on fall back to id, newest first
+    assert [t['id'] for t in data['transactions']] == [7, 6, 2, 1]
+    assert data['transactions'][0]['to_account_id'] == 1
+    assert data['next_cursor'] is None
+
+
+def test_history_pages_with_cursor(api_client):
+    for _ in range(3):
+        api_client.post('/api/transfer', json={'from_account_id': 2, 'to_account_id': 3, 'amount': 1})
+
+    seen = []
+    url = '/api/accounts/2/transactions?limit=2'
+    while url:
+        data = api_client.get(url).get_json()
+        assert len(data['transactions']) <= 2
+        seen.extend(t['id'] for t in data['transactions'])
+        url = f"/api/accounts/2/transactions?limit=2&before={data['next_cursor']}" if data['next_cursor'] else None
+
+    assert seen == [8, 7, 6, 4, 3]
+
+
+def test_history_filters(api_client):
+    data = api_client.get('/api/accounts/2/transactions?status=pending').get_json()
+    assert [t['id'] for t in data['transactions']] == [4]
+
+    data = api_client.get('/api/accounts/1/transactions?type=withdrawal').get_json()
+    assert [t['id'] for t in data['transactions']] == [2]
+
+
+def test_history_unknown_account(api_client):
+    assert api_client.get('/api/accounts/99/transactions').status_code == 404
+    assert api_client.get('/api/accounts/1/transactions?before=garbage').status_code == 400
@@ -0,0 +1,95 @@
+"""
+API Tests: Transfer Endpoint
+
+Exercises /api/transfer in-process through the Flask test client,
+including concurrent transfers racing for the same funds.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from .api_server import app
+
+
+def test_transfer_rejects_insufficient_funds(api_client, db_connection):
+    response = api_client.post('/api/transfer', json={
+        'from_account_id': 2, 'to_account_id': 1, 'amount': 500.01
+    })
+
+    assert response.status_code == 400
+    assert 'Insufficient funds' in response.get_json()['message']
+
+    balance = db_connection.execute('SELECT account_balance FROM users WHERE id = 2').fetchone()[0]
+    assert balance == pytest.approx(500.00)
+
+
+def test_transfer_returns_updated_balances(api_client, db_connection):
+    response = api_client.post('/api/transfer', json={
+        'from_account_id': 3, 'to_account_id': 1, 'amount': 250
+    })
+
+    assert response.status_code == 200
+    accounts = {account['id']: account for account in response.get_json()['accounts']}
+    assert accounts[3]['account_balance'] == pytest.approx(1750.00)
+    assert accounts[1]['account_balance'] == pytest.approx(1250.00)
+    assert accounts[1]['name'] == 'John Smith'
+
+    for account_id, account in accounts.items():
+        stored = db_connection.execute(
+            'SELECT account_balance FROM users WHERE id = ?', (account_id,)
+        ).fetchone()[0]
+        assert stored == pytest.approx(account['account_balance'])
+
+
+@pytest.mark.parametrize('from_account_id, amount, message', [
+    (1, 'NaN', 'finite'),
+    (1, 'Infinity', 'finite'),
+    (1, '1e300', 'must not exceed'),
+    (1, '1' + '0' * 400, 'must not exceed'),
+    (1, '-1' + '0' * 400, 'greater than zero'),
+    (2**63, '10', 'Account ids must be between'),
+    (-1, '10', 'Account ids must be between'),
+])
+def test_transfer_rejects_out_of_range_values(api_client, db_connection, from_account_id, amount, message):
+    body = f'{{"from_account_id": {from_account_id}, "to_account_id": 2, "amount": {amount}}}'
+    single = api_client.post('/api/transfer', data=body, content_type='application/json')
+    batch = api_client.post('/api/transfers/batch', data=f'[{body}]', content_type='application/json')
+
+    for response in (single, batch):
+        assert response.status_code == 400
+        assert message in response.get_data(as_text=True)
+    total = db_connection.execute('SELECT SUM(account_balance) FROM users').fetchone()[0]
+    assert total == pytest.approx(3500.00)
+
+
+def test_transfer_unknown_account(api_client):
+    response = api_client.post('/api/transfer', json={
+        'from_account_id': 1, 'to_account_id': 99, 'amount': 10
+    })
+
+    assert response.status_code == 404
+    assert 'Destination account 99 not found' in response.get_json()['message']
+
+
+def test_concurrent_transfers_never_overdraw(api_client, db_connection):
+    """20 clients race to move $100 out of a $500 account: exactly 5 win"""
+
+    def send_transfer(_):
+        client = app.test_client()
+        return client.post('/api/transfer', json={
+            'from_account_id': 2, 'to_account_id': 3, 'amount': 100
+        }).status_code
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(send_transfer, range(20)))
+
+    assert statuses.count(200) == 5
+    assert statuses.count(400) == 15
+
+    cursor = db_connection.cursor()
+    cursor.execute('SELECT account_balance FROM users WHERE id = 2')
+    assert cursor.fetchone()[0] == pytest.approx(0.0)
+
+    cursor.execute('SELECT SUM(account_balance) FROM users')
+    assert cursor.fetchone()[0] == pytest.approx(3500.00)
@@ -0,0 +1,93 @@
+"""
+API Tests: Batch Transfer Endpoint
+
+Validates all-or-nothing and best-effort batches against /api/transfers/batch.
+"""
+
+import pytest
+
+
+def balances(db_connection):
+    cursor = db_connection.execute('SELECT id, account_balance FROM users ORDER BY id')
+    return {row['id']: row['account_balance'] for row in cursor.fetchall()}
+
+
+def test_atomic_batch_applies_all_transfers(api_client, db_connection):
+    response = api_client.post('/api/transfers/batch', json=[
+        {'from_account_id': 1, 'to_account_id': 2, 'amount': 100},
+        {'from_account_id': 2, 'to_account_id': 3, 'amount': 550},
+        {'from_account_id': 3, 'to_account_id': 1, 'amount': 25.50},
+    ])
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['success'] is True
+    assert data['applied'] == 3
+    assert [r['transaction_id'] for r in data['results']] == [6, 7, 8]
+
+    assert balances(db_connection) == pytest.approx({1: 925.50, 2: 50.00, 3: 2524.50})
+
+    cursor = db_connection.execute("SELECT COUNT(*) FROM transactions WHERE transaction_type = 'transfer'")
+    assert cursor.fetchone()[0] == 3
+
+
+def test_atomic_batch_rolls_back_on_failure(api_client, db_connection):
+    response = api_client.post('/api/transfers/batch', json={
+        'mode': 'atomic',
+        'transfers': [
+            {'from_account_id': 1, 'to_account_id': 2, 'amount': 100},
+            {'from_account_id': 2, 'to_account_id': 3, 'amount': 10000},
+        ]
+    })
+
+    assert response.status_code == 400
+    data = response.get_json()
+    assert data['applied'] == 0
+    assert data['failed'] == 2
+    assert [result['index'] for result in data['results']] == [0, 1]
+    assert data['results'][0]['message'] == 'Not applied: batch rejected at transfer 1'
+    assert 'Insufficient funds' in data['results'][1]['message']
+
+    assert balances(db_connection) == pytest.approx({1: 1000.00, 2: 500.00, 3: 2000.00})
+
+
+def test_best_effort_batch_reports_per_item_results(api_client, db_connection):
+    response = api_client.post('/api/transfers/batch', json={
+        'mode': 'best_effort',
+        'transfers': [
+            {'from_account_id': 2, 'to_account_id': 1, 'amount': 400},
+            {'from_account_id': 2, 'to_account_id': 1, 'amount': 400},
+            {'from_account_id': 1, 'to_account_id': 1, 'amount': 5},
+            {'from_account_id': 3, 'to_account_id': 99, 'amount': 5},
+            {'from_account_id': 3, 'to_account_id': 2, 'amount': 50},
+        ]
+    })
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['applied'] == 2
+    assert data['failed'] == 3
+    assert [r['success'] for r in data['results']] == [True, False, False, False, True]
+    assert 'Insufficient funds' in data['results'][1]['message']
+    assert [r.get('transaction_id') for r in data['results'] if r['success']] == [6, 7]
+
+    assert balances(db_connection) == pytest.approx({1: 1400.00, 2: 150.00, 3: 1950.00})
+
+
+def test_best_effort_batch_isolates_out_of_range_items(api_client, db_connection):
+    huge = '1' + '0' * 400
+    body = f'''{{"mode": "best_effort", "transfers": [
+        {{"from_account_id": 1, "to_account_id": 2, "amount": 10}},
+        {{"from_account_id": 1, "to_account_id": 2, "amount": {huge}}},
+        {{"from_account_id": {2**63}, "to_account_id": 2, "amount": 10}},
+        {{"from_account_id": 3, "to_account_id": 1, "amount": 20}}
+    ]}}'''
+    response = api_client.post('/api/transfers/batch', data=body, content_type='application/json')
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [r['success'] for r in data['results']] == [True, False, False, True]
+    assert 'must not exceed' in data['results'][1]['message']
+    assert 'Account ids must be between' in data['results'][2]['message']
+
+    assert balances(db_connection) == pytest.approx({1: 1010.00, 2: 510.00, 3: 1980.00})
@@ -30,12 +30,15 @@ def test_transfer_e2e(page, db_connection, flask_server):
     cursor.execute("SELECT id, name, account_balance FROM users WHERE id =2")
     jane_before = cursor.fetchone()
     
-    # Calculate total money in the system before transfer
-    cursor.execute("SELECT SUM(account_balance) as total FROM users")
-    total_before = cursor.fetchone()['total']
+    # Total money in the system before transfer (exact cents, maintained by triggers)
+    cursor.execute("SELECT total_cents FROM ledger_summary")
+    total_before = cursor.fetchone()['total_cents']
     
     # Navigate to transfer page
     page.goto(flask_server)
+
+    # Accounts are server-rendered, so the form is usable without waiting on /api/accounts
+    page.wait_for_selector('#transfer-form[data-ready]', state='attached')
     
     # Fill out transfer form
     transfer_amount = 200
@@ -55,6 +58,12 @@ def test_transfer_e2e(page, db_connection, flask_server):
     
     assert 'success' in result_text.lower()
     assert '200' in result_text
+
+    # Balances are patched in place from the transfer response, no reload
+    page.wait_for_selector('#accounts-list[data-transaction-id]', state='attached')
+    accounts_text = page.locator('#accounts-list').text_content()
+    assert f"John Smith: ${john_before['account_balance'] - transfer_amount:.2f}" in accounts_text
+    assert f"Jane Doe: ${jane_before['account_balance'] + transfer_amount:.2f}" in accounts_text
     
     # Query databases to verify balances changed
     cursor.execute("SELECT id, name, account_balance FROM users WHERE id = 1")
@@ -72,7 +81,7 @@ def test_transfer_e2e(page, db_connection, flask_server):
     assert jane_after['account_balance'] == pytest.approx(expected_jane, abs=0.01)
     
     # Property-based validation - total money in system is unchanged
-    cursor.execute("SELECT SUM(account_balance) as total FROM users")
-    total_after = cursor.fetchone()['total']
+    cursor.execute("SELECT total_cents FROM ledger_summary")
+    total_after = cursor.fetchone()['total_cents']
     
-    assert total_after == pytest.approx(total_before, abs=0.01)
\ No newline at end of file
+    assert total_after == total_before
\ No newline at end of file
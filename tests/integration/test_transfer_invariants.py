@@ -0,0 +1,49 @@
+"""
+Property Tests: Transfer Invariants
+
+Long seeded sequences of valid and invalid transfers run in-process
+through the Flask test client, checking status codes, balances and
+conservation of money after every step.
+
+TRANSFER_SEEDS (comma-separated, default 1,2,3) and TRANSFER_STEPS
+(default 1000) widen the search.
+"""
+
+import os
+
+import pytest
+
+from . import api_server
+from .transfer_model import Step, shrink
+
+SEEDS = [int(seed) for seed in os.getenv('TRANSFER_SEEDS', '1,2,3').split(',')]
+STEPS = int(os.getenv('TRANSFER_STEPS', '1000'))
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_random_transfer_sequences_keep_invariants(transfer_runner, seed):
+    transfers_per_second = transfer_runner.run(seed, STEPS)
+    assert transfers_per_second > 0
+
+
+def test_shrink_finds_minimal_sequence():
+    steps = [Step(1, 2, amount) for amount in range(1, 200)]
+
+    def fails(candidate):
+        amounts = {step.amount for step in candidate}
+        return 17 in amounts and 140 in amounts
+
+    assert shrink(steps, fails) == [Step(1, 2, 17), Step(1, 2, 140)]
+
+
+def test_runner_reports_minimal_reproduction(transfer_runner, monkeypatch):
+    real_to_stored = api_server.to_stored
+
+    def off_by_a_cent(amount, money_scale):
+        stored = real_to_stored(amount, money_scale)
+        return stored + 1 if amount > 400 else stored
+
+    monkeypatch.setattr(api_server, 'to_stored', off_by_a_cent)
+
+    with pytest.raises(AssertionError, match=r'minimal failing sequence \(1 steps\)'):
+        transfer_runner.run(seed=1, count=300)
@@ -0,0 +1,233 @@
+"""
+Stateful Transfer Runner
+
+Drives /api/transfer in-process with long, seeded sequences of valid and
+invalid transfers and checks the ledger after every step against a
+simple in-memory model:
+- the status code matches what the model expects
+- both accounts hold the balances the model expects
+- money is conserved (ledger_summary and SUM() both equal the start total)
+
+When a sequence breaks an invariant it is shrunk (delta debugging) to a
+minimal sequence that still fails, which is what gets reported.
+
+Runs against an integer-cents database so every comparison is exact.
+"""
+
+import random
+import time
+from collections import namedtuple
+
+Step = namedtuple('Step', 'from_account_id to_account_id amount')
+
+UNKNOWN_ACCOUNT = 999
+
+# (kind, weight) of generated steps; everything but 'valid' must be rejected
+STEP_MIX = (
+    ('valid', 60),
+    ('overdraw', 10),
+    ('same_account', 5),
+    ('unknown_from', 4),
+    ('unknown_to', 4),
+    ('non_positive', 5),
+    ('sub_cent', 4),
+    ('missing', 4),
+    ('wrong_type', 4),
+)
+
+
+def generate_steps(seed, count, account_ids, balances=None):
+    """
+    Yield `count` transfers between account_ids from a seeded RNG.
+
+    `balances` (cents) is used to pick overdrawing amounts; it is only a
+    hint, so generation does not need to track the model.
+    """
+    rng = random.Random(seed)
+    kinds, weights = zip(*STEP_MIX)
+    balances = balances or {}
+
+    for _ in range(count):
+        kind = rng.choices(kinds, weights)[0]
+        from_id, to_id = rng.sample(account_ids, 2)
+        amount = rng.randint(1, 50000) / 100
+
+        if kind == 'overdraw':
+            amount = (balances.get(from_id, 0) + rng.randint(1, 100000)) / 100
+        elif kind == 'same_account':
+            to_id = from_id
+        elif kind == 'unknown_from':
+            from_id = UNKNOWN_ACCOUNT
+        elif kind == 'unknown_to':
+            to_id = UNKNOWN_ACCOUNT
+        elif kind == 'non_positive':
+            amount = rng.choice([0, -amount])
+        elif kind == 'sub_cent':
+            amount = 0.004
+        elif kind == 'missing':
+            field = rng.randrange(3)
+            from_id, to_id, amount = [None if i == field else value
+                                      for i, value in enumerate((from_id, to_id, amount))]
+        elif kind == 'wrong_type':
+            field = rng.randrange(3)
+            from_id, to_id, amount = [str(value) if i == field else value
+                                      for i, value in enumerate((from_id, to_id, amount))]
+
+        yield Step(from_id, to_id, amount)
+
+
+class LedgerModel:
+    """Expected account balances (in cents) and the API's accept/reject rules"""
+
+    def __init__(self, balances):
+        self.balances = dict(balances)
+
+    def expect(self, step):
+        """Apply step to the model; returns the expected HTTP status"""
+        from_id, to_id, amount = step
+        if not all([from_id, to_id, amount]):
+            return 400
+        if any(type(value) is not int for value in (from_id, to_id)):
+            return 400
+        if type(amount) not in (int, float):
+            return 400
+        if from_id == to_id or amount <= 0:
+            return 400
+
+        cents = round(amount * 100)
+        if cents / 100 != amount:
+            return 400
+
+        # The server touches the lower account id first
+        for account_id in sorted((from_id, to_id)):
+            if account_id not in self.balances:
+                return 404
+            if account_id == from_id and self.balances[from_id] < cents:
+                return 400
+
+        self.balances[from_id] -= cents
+        self.balances[to_id] += cents
+        return 200
+
+
+class InvariantViolation(AssertionError):
+    """A step whose outcome disagrees with the model"""
+
+    def __init__(self, index, step, message):
+        super().__init__(f'step {index} {step}: {message}')
+        self.index = index
+        self.step = step
+
+
+class TransferRunner:
+    """
+    Applies step sequences through a Flask test client and checks invariants.
+
+    Args:
+        client: Flask test client for api_server.app
+        conn: SQLite connection to the database the app is using
+        reset: Callable that restores the database to its starting state
+    """
+
+    def __init__(self, client, conn, reset):
+        self.client = client
+        self.conn = conn
+        self.reset = reset
+
+    def balances(self):
+        return dict(self.conn.execute('SELECT id, account_balance FROM users'))
+
+    def total(self):
+        return self.conn.execute('SELECT total_cents FROM ledger_summary').fetchone()[0]
+
+    def check(self, steps):
+        """Run steps from a fresh database; raises InvariantViolation on the first bad step"""
+        self.reset()
+        model = LedgerModel(self.balances())
+        start_total = self.total()
+
+        for index, step in enumerate(steps):
+            expected = model.expect(step)
+            response = self.client.post('/api/transfer', json=step._asdict())
+            if response.status_code != expected:
+                raise InvariantViolation(
+                    index, step,
+                    f'expected HTTP {expected}, got {response.status_code}: {response.get_json()}'
+                )
+
+            touched = [account_id for account_id in (step.from_account_id, step.to_account_id)
+                       if account_id in model.balances]
+            for account_id in touched:
+                actual = self.conn.execute(
+                    'SELECT account_balance FROM users WHERE id = ?', (account_id,)
+                ).fetchone()[0]
+                if actual != model.balances[account_id]:
+                    raise InvariantViolation(
+                        index, step,
+                        f'account {account_id} holds {actual}, expected {model.balances[account_id]}'
+                    )
+
+            total = self.total()
+            if total != start_total:
+                raise InvariantViolation(index, step, f'system total {total} != {start_total}')
+
+        scanned = self.conn.execute('SELECT SUM(account_balance) FROM users').fetchone()[0]
+        if scanned != start_total:
+            raise InvariantViolation(len(steps), None, f'SUM(account_balance) {scanned} != {start_total}')
+
+    def fails(self, steps):
+        try:
+            self.check(steps)
+        except InvariantViolation:
+            return True
+        return False
+
+    def run(self, seed, count):
+        """
+        Check a seeded sequence of `count` steps.
+
+        Returns transfers per second. On failure raises AssertionError with
+        the shrunk, minimal failing sequence.
+        """
+        self.reset()
+        account_ids = sorted(self.balances())
+        steps = list(generate_steps(seed, count, account_ids, self.balances()))
+
+        started = time.perf_counter()
+        try:
+            self.check(steps)
+        except InvariantViolation as violation:
+            # Everything after the failing step is irrelevant
+            minimal = shrink(steps[:violation.index + 1], self.fails)
+            try:
+                self.check(minimal)
+            except InvariantViolation as reproduced:
+                violation = reproduced
+            raise AssertionError(
+                f'seed {seed}: {violation}\nminimal failing sequence ({len(minimal)} steps):\n'
+                + '\n'.join(f'  {step}' for step in minimal)
+            ) from None
+        return count / (time.perf_counter() - started)
+
+
+def shrink(steps, fails):
+    """
+    Reduce a failing sequence to a 1-minimal one (ddmin).
+
+    Tries dropping ever smaller chunks and keeps any smaller sequence for
+    which fails() still holds, until no single step can be removed.
+    """
+    chunks = 2
+    while len(steps) >= 2:
+        size = -(-len(steps) // chunks)  # ceiling division
+        for start in range(0, len(steps), size):
+            candidate = steps[:start] + steps[start + size:]
+            if candidate and fails(candidate):
+                steps = candidate
+                chunks = max(chunks - 1, 2)
+                break
+        else:
+            if size == 1:
+                break
+            chunks = min(chunks * 2, len(steps))
+    return steps
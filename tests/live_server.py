@@ -0,0 +1,214 @@
+"""
+Live Server Helper
+
+Runs a WSGI app under waitress on an OS-assigned port in a background
+thread, waits until the socket accepts connections, and shuts it down
+cleanly.
+"""
+
+import http.client
+import socket
+import subprocess
+import threading
+import time
+
+from waitress import wasyncore
+from waitress.server import create_server
+
+
+class ServerNotReady(RuntimeError):
+    """Raised when a live server does not accept connections in time"""
+
+
+def wait_for_port(host, port, timeout=5.0, interval=0.01):
+    """
+    Block until a TCP connection to host:port succeeds.
+
+    Raises ServerNotReady with the last connection error if the port is
+    still closed after `timeout` seconds.
+    """
+    deadline = time.monotonic() + timeout
+    last_error = None
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=interval * 10):
+                return
+        except OSError as e:
+            last_error = e
+            time.sleep(interval)
+    raise ServerNotReady(
+        f"Server on {host}:{port} did not accept connections within "
+        f"{timeout:.1f}s (last error: {last_error})"
+    )
+
+
+def wait_for_http(host, port, timeout=10.0, interval=0.05):
+    """
+    Block until an HTTP request to host:port gets any response.
+
+    Needed when the listening socket is bound before the server behind
+    it is running, so an open port alone does not mean ready.
+    """
+    deadline = time.monotonic() + timeout
+    last_error = None
+    while time.monotonic() < deadline:
+        conn = http.client.HTTPConnection(host, port, timeout=interval * 20)
+        try:
+            conn.request('GET', '/')
+            conn.getresponse().read()
+            return
+        except (OSError, http.client.HTTPException) as e:
+            last_error = e
+            time.sleep(interval)
+        finally:
+            conn.close()
+    raise ServerNotReady(
+        f"Server on {host}:{port} did not answer HTTP within "
+        f"{timeout:.1f}s (last error: {last_error})"
+    )
+
+
+class LiveServer:
+    """
+    Background-thread WSGI server bound to an ephemeral port.
+
+    Usage:
+        server = LiveServer(app).start()
+        requests go to server.url
+        server.stop()
+
+    Reset hooks registered with add_reset_hook() run on every reset(),
+    which lets session-scoped servers restore per-test state cheaply.
+
+    Extra keyword arguments are waitress settings (threads, backlog,
+    channel_timeout, ...).
+    """
+
+    def __init__(self, app, host='127.0.0.1', port=0, ready_timeout=5.0, **server_options):
+        self.app = app
+        self.host = host
+        self.requested_port = port
+        self.ready_timeout = ready_timeout
+        self.server_options = server_options
+        self.port = None
+        self._server = None
+        self._thread = None
+        self._reset_hooks = []
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        self._server = create_server(
+            self.app, host=self.host, port=self.requested_port, **self.server_options
+        )
+        self.port = self._server.effective_port
+
+        self._thread = threading.Thread(
+            target=self._server.run,
+            name=f"live-server-{self.port}",
+            daemon=True,
+        )
+        self._thread.start()
+
+        try:
+            wait_for_port(self.host, self.port, timeout=self.ready_timeout)
+        except ServerNotReady:
+            self.stop()
+            raise
+        return self
+
+    def stop(self, timeout=5.0):
+        if self._server is None:
+            return
+        server = self._server
+
+        # Close the listener and every open connection from inside the
+        # server's own loop; the loop exits once nothing is left to watch
+        server.trigger.pull_trigger(lambda: wasyncore.close_all(server._map))
+        self._thread.join(timeout)
+        server.task_dispatcher.shutdown()
+
+        self._server = None
+        self._thread = None
+
+    def add_reset_hook(self, hook):
+        """Register a callable to run before each test that uses the server"""
+        self._reset_hooks.append(hook)
+        return hook
+
+    def reset(self):
+        for hook in self._reset_hooks:
+            hook()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class ServerProcess:
+    """
+    A server command running in a subprocess on a socket bound here.
+
+    The listening socket is created with an OS-assigned port and passed to
+    the child; `{fd}` in the command is replaced with its file descriptor.
+    This lets fixtures start multi-process servers without racing for ports.
+
+    Usage:
+        server = ServerProcess([sys.executable, 'api_server.py', '--fd', '{fd}']).start()
+        requests go to server.url
+        server.stop()
+    """
+
+    def __init__(self, command, host='127.0.0.1', port=0, backlog=1024, ready_timeout=10.0, env=None):
+        self.command = command
+        self.host = host
+        self.requested_port = port
+        self.backlog = backlog
+        self.ready_timeout = ready_timeout
+        self.env = env
+        self.port = None
+        self._socket = None
+        self._process = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        self._socket = socket.create_server((self.host, self.requested_port), backlog=self.backlog)
+        self._socket.set_inheritable(True)
+        self.port = self._socket.getsockname()[1]
+
+        fd = self._socket.fileno()
+        command = [str(arg).format(fd=fd) for arg in self.command]
+        self._process = subprocess.Popen(command, pass_fds=[fd], env=self.env)
+
+        try:
+            wait_for_http(self.host, self.port, timeout=self.ready_timeout)
+        except ServerNotReady:
+            self.stop()
+            raise
+        return self
+
+    def stop(self, timeout=10.0):
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+            self._process = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
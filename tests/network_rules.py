@@ -0,0 +1,111 @@
+"""
+Network Rules for UI Tests
+
+HAR record/replay and resource blocking applied to a BrowserContext
+through Playwright routing.
+
+Defaults come from environment variables and can be overridden per test
+with markers:
+- PW_HAR_MODE: off (default), record, replay, or auto (replay when the
+  HAR exists, otherwise record). @pytest.mark.har("name.har") picks the file.
+- PW_HAR_NOT_FOUND: abort (default) or fallback, for requests missing
+  from the HAR during replay
+- PW_BLOCK_RESOURCES: comma-separated resource types to abort,
+  e.g. "image,font,media"
+- PW_BLOCK_THIRD_PARTY=1: abort requests to hosts other than the ones
+  the page navigated to
+  @pytest.mark.block_resources("image", third_party=True) overrides both.
+"""
+
+import os
+from urllib.parse import urlsplit
+
+HAR_DIR = os.path.join(os.path.dirname(__file__), 'hars')
+HAR_MODES = ('off', 'record', 'replay', 'auto')
+
+
+class ResourceBlocker:
+    """
+    Route handler that aborts unneeded requests.
+
+    Anything not blocked falls through to other handlers (e.g. HAR
+    replay) or the network.
+    """
+
+    def __init__(self, resource_types=(), third_party=False):
+        self.resource_types = set(resource_types)
+        self.third_party = third_party
+        self.first_party_hosts = set()
+        self.blocked = 0
+
+    def _is_third_party(self, host):
+        return not any(
+            host == first or host.endswith('.' + first)
+            for first in self.first_party_hosts
+        )
+
+    def handle(self, route):
+        request = route.request
+        host = urlsplit(request.url).hostname or ''
+
+        if request.is_navigation_request():
+            self.first_party_hosts.add(host)
+        elif request.resource_type in self.resource_types or (
+            self.third_party and self._is_third_party(host)
+        ):
+            self.blocked += 1
+            route.abort()
+            return
+
+        route.fallback()
+
+    @property
+    def active(self):
+        return bool(self.resource_types) or self.third_party
+
+
+def har_settings(node):
+    """Return (mode, path) for a test from PW_HAR_MODE and the har marker"""
+    mode = os.getenv('PW_HAR_MODE', 'off')
+    if mode not in HAR_MODES:
+        raise ValueError(f"PW_HAR_MODE must be one of {', '.join(HAR_MODES)}, got {mode!r}")
+
+    marker = node.get_closest_marker('har')
+    if marker and marker.args:
+        path = os.path.join(HAR_DIR, marker.args[0])
+    else:
+        path = os.path.join(HAR_DIR, node.path.stem, f'{node.name}.har')
+
+    if mode == 'auto':
+        mode = 'replay' if os.path.exists(path) else 'record'
+    return mode, path
+
+
+def resource_blocker(node):
+    """Build the ResourceBlocker for a test from PW_BLOCK_* and the block_resources marker"""
+    marker = node.get_closest_marker('block_resources')
+    if marker:
+        return ResourceBlocker(marker.args, marker.kwargs.get('third_party', False))
+
+    types = [t.strip() for t in os.getenv('PW_BLOCK_RESOURCES', '').split(',') if t.strip()]
+    return ResourceBlocker(types, os.getenv('PW_BLOCK_THIRD_PARTY') == '1')
+
+
+def apply_network_rules(context, node):
+    """
+    Install HAR routing and resource blocking on a context for one test.
+
+    Blocking is registered last so it runs first; requests it lets
+    through fall back to HAR replay (or the live network).
+    """
+    mode, path = har_settings(node)
+    if mode == 'record':
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        context.route_from_har(path, update=True, update_content='embed')
+    elif mode == 'replay':
+        context.route_from_har(path, not_found=os.getenv('PW_HAR_NOT_FOUND', 'abort'))
+
+    blocker = resource_blocker(node)
+    if blocker.active:
+        context.route('**/*', blocker.handle)
+    return blocker
@@ -0,0 +1,48 @@
+"""
+Benchmark Baselines
+
+Stores benchmark results as JSON and compares new runs against them.
+"""
+
+import json
+import os
+
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baselines(path, baselines):
+    with open(path, 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def find_regressions(result, baseline, threshold):
+    """
+    Compare a run against its baseline.
+
+    A run regresses when throughput drops, or p95/p99 latency grows, by
+    more than `threshold` (a fraction, e.g. 0.2 for 20%). Returns a list
+    of human-readable regression messages (empty when the run is fine).
+    """
+    regressions = []
+
+    floor = baseline['throughput_rps'] * (1 - threshold)
+    if result['throughput_rps'] < floor:
+        regressions.append(
+            f"throughput {result['throughput_rps']:.1f} rps < {floor:.1f} rps "
+            f"(baseline {baseline['throughput_rps']:.1f})"
+        )
+
+    for key in ('p95_ms', 'p99_ms'):
+        ceiling = baseline[key] * (1 + threshold)
+        if result[key] > ceiling:
+            regressions.append(
+                f"{key} {result[key]:.2f} ms > {ceiling:.2f} ms (baseline {baseline[key]:.2f})"
+            )
+
+    return regressions
@@ -0,0 +1,128 @@
+"""
+Performance Test Fixtures
+
+Benchmarks only run when RUN_PERF=1, so regular test runs stay fast.
+
+Tuned through environment variables:
+- PERF_ACCOUNTS: accounts in the seeded dataset (default 1000)
+- PERF_TRANSACTIONS: transaction history entries in the seeded dataset (default 0)
+- PERF_CONCURRENCY: client threads (default 8)
+- PERF_SERVER_THREADS: request threads per server process (default 16)
+- PERF_SERVER_PROCESSES: forked server worker processes (default 1)
+- PERF_REQUESTS: requests per benchmark (default 2000)
+- PERF_THRESHOLD: allowed regression as a fraction (default 0.2)
+- PERF_UPDATE_BASELINE=1: overwrite stored baselines with this run
+- PERF_RESULTS: where to write this run's results (default tests/perf/results.json)
+"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+from live_server import LiveServer, ServerProcess
+from integration import api_server
+from integration.api_server import DEFAULT_THREADS, app, close_pools, server_options
+from integration.setup_test_db import create_schema, populate_database, restore_from_template
+
+from .baseline import find_regressions, load_baselines, save_baselines
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "perf: load/benchmark test, runs only with RUN_PERF=1")
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.getenv('RUN_PERF') == '1':
+        return
+    skip_perf = pytest.mark.skip(reason="benchmarks run only with RUN_PERF=1")
+    for item in items:
+        if 'perf' in item.keywords:
+            item.add_marker(skip_perf)
+
+
+@pytest.fixture(scope="session")
+def perf_settings():
+    return {
+        'accounts': int(os.getenv('PERF_ACCOUNTS', '1000')),
+        'transactions': int(os.getenv('PERF_TRANSACTIONS', '0')),
+        'concurrency': int(os.getenv('PERF_CONCURRENCY', '8')),
+        'server_threads': int(os.getenv('PERF_SERVER_THREADS', str(DEFAULT_THREADS))),
+        'server_processes': int(os.getenv('PERF_SERVER_PROCESSES', '1')),
+        'requests': int(os.getenv('PERF_REQUESTS', '2000')),
+        'threshold': float(os.getenv('PERF_THRESHOLD', '0.2')),
+        'update_baseline': os.getenv('PERF_UPDATE_BASELINE') == '1',
+        'results_path': os.getenv('PERF_RESULTS', os.path.join(os.path.dirname(__file__), 'results.json')),
+    }
+
+
+@pytest.fixture(scope="session")
+def perf_server(perf_settings, tmp_path_factory):
+    """Flask API server on a seeded database of PERF_ACCOUNTS accounts and PERF_TRANSACTIONS entries"""
+    db_path = str(tmp_path_factory.mktemp('perf') / 'perf_data.db')
+    template = sqlite3.connect(':memory:')
+    create_schema(template.cursor())
+    template.commit()
+    populate_database(template, perf_settings['accounts'], perf_settings['transactions'])
+    restore_from_template(template, db_path)
+    template.close()
+    app.config['DATABASE'] = db_path
+
+    threads = perf_settings['server_threads']
+    processes = perf_settings['server_processes']
+    if processes > 1:
+        server = ServerProcess([
+            sys.executable, api_server.__file__,
+            '--fd', '{fd}',
+            '--db', db_path,
+            '--threads', threads,
+            '--processes', processes,
+        ]).start()
+    else:
+        server = LiveServer(app, **server_options(threads=threads)).start()
+
+    yield server
+    server.stop()
+    close_pools()
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(perf_settings):
+    """Collects results from every benchmark and writes them as JSON at session end"""
+    results = {}
+    yield results
+    if results:
+        save_baselines(perf_settings['results_path'], results)
+        if perf_settings['update_baseline']:
+            baselines = load_baselines(BASELINE_PATH)
+            baselines.update(results)
+            save_baselines(BASELINE_PATH, baselines)
+
+
+@pytest.fixture
+def check_baseline(perf_settings, benchmark_results):
+    """
+    Record a result and fail if it regressed past PERF_THRESHOLD.
+
+    Benchmarks without a stored baseline only record their result.
+    """
+    baselines = load_baselines(BASELINE_PATH)
+
+    def check(result):
+        benchmark_results[result['name']] = result
+        print(
+            f"\n{result['name']}: {result['throughput_rps']:.1f} rps, "
+            f"p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, "
+            f"p99 {result['p99_ms']:.2f} ms, errors {result['errors']}"
+        )
+
+        baseline = baselines.get(result['name'])
+        if baseline is None or perf_settings['update_baseline']:
+            return
+        regressions = find_regressions(result, baseline, perf_settings['threshold'])
+        assert not regressions, f"{result['name']} regressed: " + '; '.join(regressions)
+
+    return check
@@ -0,0 +1,128 @@
+"""
+Load Generator
+
+Drives HTTP endpoints from a pool of worker threads, each holding its own
+keep-alive connection, and summarizes throughput and latency percentiles.
+"""
+
+import http.client
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(name, latencies, errors, elapsed, concurrency):
+    """Build a JSON-serializable result from raw latencies (seconds)"""
+    latencies = sorted(latencies)
+    total = len(latencies)
+    return {
+        'name': name,
+        'requests': total,
+        'errors': errors,
+        'concurrency': concurrency,
+        'elapsed_s': round(elapsed, 4),
+        'throughput_rps': round(total / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+class Scenario:
+    """
+    A named stream of requests.
+
+    make_request(rng) returns (method, path, json_body_or_None) and is called
+    once per request with a per-worker random.Random, so runs are repeatable.
+    """
+
+    def __init__(self, name, make_request, ok_statuses=(200,)):
+        self.name = name
+        self.make_request = make_request
+        self.ok_statuses = ok_statuses
+
+
+def accounts_scenario(limit=100):
+    return Scenario('accounts', lambda rng: ('GET', f'/api/accounts?limit={limit}', None))
+
+
+def transfer_scenario(account_count, max_amount=5.0):
+    """Random small transfers between distinct accounts (insufficient funds counts as handled)"""
+
+    def make_request(rng):
+        from_id, to_id = rng.sample(range(1, account_count + 1), 2)
+        amount = round(rng.uniform(0.01, max_amount), 2)
+        return 'POST', '/api/transfer', {
+            'from_account_id': from_id,
+            'to_account_id': to_id,
+            'amount': amount,
+        }
+
+    return Scenario('transfer', make_request, ok_statuses=(200, 400))
+
+
+def run_load(base_url, scenario, concurrency=8, requests=1000, seed=0):
+    """
+    Send `requests` requests for `scenario` using `concurrency` threads.
+
+    Each thread keeps one keep-alive connection and its own seeded RNG.
+    Returns the summary dict produced by summarize().
+    """
+    parts = urlsplit(base_url)
+    per_worker = [requests // concurrency + (1 if i < requests % concurrency else 0)
+                  for i in range(concurrency)]
+    lock = threading.Lock()
+    latencies = []
+    errors = 0
+
+    def worker(worker_id):
+        nonlocal errors
+        rng = random.Random(f'{seed}-{worker_id}')
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        local_latencies = []
+        local_errors = 0
+        try:
+            for _ in range(per_worker[worker_id]):
+                method, path, body = scenario.make_request(rng)
+                headers = {}
+                payload = None
+                if body is not None:
+                    payload = json.dumps(body)
+                    headers['Content-Type'] = 'application/json'
+
+                start = time.perf_counter()
+                try:
+                    conn.request(method, path, body=payload, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    ok = response.status in scenario.ok_statuses
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    ok = False
+                local_latencies.append(time.perf_counter() - start)
+                if not ok:
+                    local_errors += 1
+        finally:
+            conn.close()
+
+        with lock:
+            latencies.extend(local_latencies)
+            errors += local_errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return summarize(scenario.name, latencies, errors, elapsed, concurrency)
@@ -0,0 +1,34 @@
+"""
+Performance Tests: Banking API
+
+Benchmarks /api/accounts and /api/transfer against the in-repo server.
+Run with: RUN_PERF=1 pytest tests/perf -s
+"""
+
+import pytest
+
+from .load_generator import accounts_scenario, run_load, transfer_scenario
+
+pytestmark = pytest.mark.perf
+
+
+def test_accounts_throughput(perf_server, perf_settings, check_baseline):
+    result = run_load(
+        perf_server.url,
+        accounts_scenario(),
+        concurrency=perf_settings['concurrency'],
+        requests=perf_settings['requests'],
+    )
+    assert result['errors'] == 0
+    check_baseline(result)
+
+
+def test_transfer_throughput(perf_server, perf_settings, check_baseline):
+    result = run_load(
+        perf_server.url,
+        transfer_scenario(perf_settings['accounts']),
+        concurrency=perf_settings['concurrency'],
+        requests=perf_settings['requests'],
+    )
+    assert result['errors'] == 0
+    check_baseline(result)
@@ -0,0 +1,158 @@
+"""
+Phase Timing Plugin
+
+Times where the suite spends its time:
+- setup, call and teardown for every test
+- setup and teardown for every fixture, attributed to the test that
+  triggered them. Session fixtures such as browser launch or database
+  creation show up on the first and last test that use them.
+- page navigations recorded by the page fixture
+
+Results go to a JSON report, and the slowest phases are printed at the
+end of the run. Under pytest-xdist the timings travel back to the
+controller on the test reports, so there is still only one report.
+
+Tuned through environment variables:
+- PHASE_REPORT: JSON report path (default tests/phase_report.json, "off" to disable)
+- PHASE_SUMMARY: slowest phases to print (default 10, 0 to disable)
+- PHASE_SLOW_SECONDS: a test call at least this long counts as slow (default 5)
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+DEFAULT_REPORT_PATH = os.path.join(os.path.dirname(__file__), 'phase_report.json')
+
+REPORTS_KEY = pytest.StashKey()
+NAVIGATION_KEY = pytest.StashKey()
+
+
+def slow_seconds():
+    return float(os.getenv('PHASE_SLOW_SECONDS', '5'))
+
+
+def failed_or_slow(node):
+    """True once a test has failed in any phase so far, or its call was slow"""
+    reports = node.stash.get(REPORTS_KEY, {})
+    if any(report.failed for report in reports.values()):
+        return True
+    call = reports.get('call')
+    return call is not None and call.duration >= slow_seconds()
+
+
+def record_navigation(node, timing):
+    """Attach one navigation timing entry (a JSON-serializable dict) to a test"""
+    node.stash.setdefault(NAVIGATION_KEY, []).append(timing)
+
+
+class PhaseTimer:
+    """Collects per-phase timings and writes the report at the end of the session"""
+
+    def __init__(self, config):
+        self.config = config
+        self.report_path = os.getenv('PHASE_REPORT', DEFAULT_REPORT_PATH)
+        self.summary_size = int(os.getenv('PHASE_SUMMARY', '10'))
+        self.is_worker = hasattr(config, 'workerinput')
+
+        self.tests = {}
+        self._fixture_timings = []
+        self._teardown_started = {}
+
+    def _record_fixture(self, fixturedef, phase, duration):
+        self._fixture_timings.append({
+            'fixture': fixturedef.argname,
+            'scope': fixturedef.scope,
+            'phase': phase,
+            'duration': duration,
+        })
+
+    # Collection of timings (runs wherever the tests run)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        start = time.perf_counter()
+        result = yield
+        self._record_fixture(fixturedef, 'setup', time.perf_counter() - start)
+
+        # Finalizers run last-in first-out, so this one fires right before
+        # the fixture's own teardown; pytest_fixture_post_finalizer ends it
+        fixturedef.addfinalizer(
+            lambda: self._teardown_started.setdefault(id(fixturedef), time.perf_counter())
+        )
+        return result
+
+    def pytest_fixture_post_finalizer(self, fixturedef, request):
+        start = self._teardown_started.pop(id(fixturedef), None)
+        if start is not None:
+            self._record_fixture(fixturedef, 'teardown', time.perf_counter() - start)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        report = yield
+        item.stash.setdefault(REPORTS_KEY, {})[report.when] = report
+
+        # Custom report attributes are serialized, so they reach the
+        # xdist controller along with the report itself
+        report.fixture_timings = self._fixture_timings
+        self._fixture_timings = []
+        if report.when == 'teardown':
+            report.navigation_timings = item.stash.get(NAVIGATION_KEY, [])
+        return report
+
+    # Aggregation and reporting (runs on the controller)
+
+    def pytest_runtest_logreport(self, report):
+        if self.is_worker:
+            return
+        entry = self.tests.setdefault(report.nodeid, {
+            'nodeid': report.nodeid,
+            'outcome': 'passed',
+            'phases': {},
+            'fixtures': [],
+            'navigation': [],
+        })
+        entry['phases'][report.when] = report.duration
+        entry['fixtures'].extend(getattr(report, 'fixture_timings', []))
+        entry['navigation'].extend(getattr(report, 'navigation_timings', []))
+        if report.failed:
+            entry['outcome'] = 'failed'
+        elif report.skipped and entry['outcome'] == 'passed':
+            entry['outcome'] = 'skipped'
+
+    def slowest(self, count):
+        """The `count` slowest phases as (duration, description, nodeid)"""
+        phases = []
+        for test in self.tests.values():
+            for when, duration in test['phases'].items():
+                phases.append((duration, when, test['nodeid']))
+            for fixture in test['fixtures']:
+                description = f"{fixture['phase']} fixture {fixture['fixture']} ({fixture['scope']})"
+                phases.append((fixture['duration'], description, test['nodeid']))
+            for navigation in test['navigation']:
+                if navigation.get('duration') is not None:
+                    phases.append((navigation['duration'], f"navigate {navigation['url']}", test['nodeid']))
+        phases.sort(key=lambda phase: phase[0], reverse=True)
+        return phases[:count]
+
+    def pytest_sessionfinish(self, session):
+        if self.is_worker or self.report_path == 'off' or not self.tests:
+            return
+        report = {
+            'created': time.time(),
+            'slow_seconds': slow_seconds(),
+            'tests': list(self.tests.values()),
+        }
+        with open(self.report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.is_worker or self.summary_size <= 0 or not self.tests:
+            return
+        terminalreporter.write_sep('=', f'slowest {self.summary_size} phases')
+        for duration, description, nodeid in self.slowest(self.summary_size):
+            terminalreporter.write_line(f"{duration:8.3f}s {description:<50} {nodeid}")
+        if self.report_path != 'off':
+            terminalreporter.write_line(f"Phase report: {self.report_path}")
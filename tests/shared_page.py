@@ -0,0 +1,158 @@
+"""
+Shared Pages for Read-only UI Tests
+
+Tests marked @pytest.mark.shared_page(url) promise not to change the
+page. They get one already-loaded page per URL, shared across the module
+(or the session with scope="session"), instead of a fresh context and
+navigation each.
+
+The promise is checked after every test. A MutationObserver and
+input/change listeners are installed when the page loads, and main-frame
+navigations are counted. A test that changed the DOM, typed into the
+page or navigated away fails, and the page is dropped, so the next test
+starts from a fresh navigation.
+
+Pages are also keyed by the test's har and block_resources markers, so
+tests only share a page loaded under the same network rules. Shared
+pages are not traced under PW_TRACE: the context outlives any one test.
+When the browser pool recycles the browser the cache is emptied and
+pages are loaded again in the new browser.
+"""
+
+SHARED_PAGE_SCOPES = ('module', 'session')
+
+# Markers that change how a page loads (see network_rules.py)
+NETWORK_MARKERS = ('har', 'block_resources')
+
+# Installed once per document; gone after any reload or navigation
+WATCH_MUTATIONS = """() => {
+    if (window.__sharedPage) return;
+    const state = window.__sharedPage = {mutations: 0, inputs: 0};
+    new MutationObserver(records => { state.mutations += records.length; })
+        .observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    for (const type of ['input', 'change']) {
+        document.addEventListener(type, () => { state.inputs += 1; }, true);
+    }
+}"""
+
+READ_MUTATIONS = "() => window.__sharedPage ? {...window.__sharedPage} : null"
+
+
+class SharedPageMutated(AssertionError):
+    """A test marked shared_page changed the page it was given"""
+
+
+def shared_page_settings(marker):
+    """Return (url, scope) from a shared_page marker"""
+    if not marker.args:
+        raise ValueError('@pytest.mark.shared_page needs the URL to load')
+    scope = marker.kwargs.get('scope', 'module')
+    if scope not in SHARED_PAGE_SCOPES:
+        raise ValueError(f"shared_page scope must be one of {', '.join(SHARED_PAGE_SCOPES)}, got {scope!r}")
+    return marker.args[0], scope
+
+
+def network_key(node):
+    """Hashable summary of the network-rule markers on a test"""
+    key = []
+    for name in NETWORK_MARKERS:
+        marker = node.get_closest_marker(name)
+        if marker is not None:
+            key.append((name, marker.args, tuple(sorted(marker.kwargs.items()))))
+    return tuple(key)
+
+
+class _Entry:
+    def __init__(self, page, url):
+        self.page = page
+        self.url = url
+        self.loaded_url = None
+        self.navigations = 0
+
+    def on_navigated(self, frame):
+        if frame == self.page.main_frame:
+            self.navigations += 1
+
+
+class SharedPageCache:
+    """
+    Loaded pages by URL in one context borrowed from the browser pool.
+
+    Args:
+        browser_pool: BrowserContextPool to borrow the context from
+        on_new_page: Optional callable(page, node) run for each new page
+            before it navigates, e.g. to apply network rules or timing
+    """
+
+    def __init__(self, browser_pool, on_new_page=None):
+        self.browser_pool = browser_pool
+        self.on_new_page = on_new_page
+        self.context = None
+        self.navigations = 0
+        self._entries = {}
+        browser_pool.add_recycle_listener(self._forget)
+
+    def _forget(self):
+        """Drop every page and the context; the pool is about to close them"""
+        self._entries.clear()
+        self.context = None
+
+    def get(self, url, node):
+        key = (url, network_key(node))
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry.page
+
+        if self.context is None:
+            self.context = self.browser_pool.acquire()
+        page = self.context.new_page()
+        entry = _Entry(page, url)
+        if self.on_new_page is not None:
+            self.on_new_page(page, node)
+
+        page.goto(url)
+        self.navigations += 1
+        page.evaluate(WATCH_MUTATIONS)
+        entry.loaded_url = page.url
+        page.on('framenavigated', entry.on_navigated)
+
+        self._entries[key] = entry
+        return page
+
+    def verify(self, url, node):
+        """Raise SharedPageMutated (and drop the page) if it is no longer pristine"""
+        key = (url, network_key(node))
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+
+        problems = []
+        if entry.page.is_closed():
+            problems.append('the page was closed')
+        else:
+            if entry.navigations or entry.page.url != entry.loaded_url:
+                problems.append(f'it navigated to {entry.page.url}')
+            state = entry.page.evaluate(READ_MUTATIONS)
+            if state is None:
+                problems.append('the document was replaced')
+            else:
+                if state['mutations']:
+                    problems.append(f"{state['mutations']} DOM mutation(s)")
+                if state['inputs']:
+                    problems.append(f"{state['inputs']} input/change event(s)")
+
+        if problems:
+            del self._entries[key]
+            if not entry.page.is_closed():
+                entry.page.close()
+            raise SharedPageMutated(
+                f"Test marked shared_page({url!r}) changed the page: {'; '.join(problems)}. "
+                "Drop the marker to give it a fresh page."
+            )
+
+    def close(self):
+        self.browser_pool.remove_recycle_listener(self._forget)
+        self._entries.clear()
+        if self.context is not None:
+            self.browser_pool.release(self.context)
+            self.context = None
@@ -1,5 +1,6 @@
+import pytest
 from playwright.sync_api import expect
 
+@pytest.mark.shared_page("https://example.com", scope="session")
 def test_has_body(page):
-    page.goto("https://example.com")
-    
+    expect(page.locator("body")).to_be_visible()
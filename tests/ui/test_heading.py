@@ -1,6 +1,7 @@
+import pytest
 from playwright.sync_api import Page, expect
 
+@pytest.mark.shared_page("https://example.com", scope="session")
 def test_has_heading(page: Page):
-    page.goto("https://example.com")
     heading = page.get_by_role("heading", name="Example Domain")
-    expect(heading).to_have_text("Example Domain") 
+    expect(heading).to_have_text("Example Domain")
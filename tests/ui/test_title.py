@@ -1,6 +1,6 @@
+import pytest
 from playwright.sync_api import expect
 
+@pytest.mark.shared_page("https://example.com", scope="session")
 def test_has_title(page):
-    page.goto("https://example.com")
     expect(page).to_have_title("Example Domain")
-    